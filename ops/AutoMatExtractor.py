@@ -76,7 +76,7 @@ class RBST_AutoMat_OT_AutoMatExtractor(bpy.types.Operator):
         common_outside = prefs.automat_common_outside_blend if prefs else False
         
         # Get selected images
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
+        selected_images = [img for img in bpy.data.images if img.bst_selected]
         
         if not selected_images:
             self.report({'WARNING'}, "No images selected for extraction")
@@ -1,5 +1,8 @@
 import bpy
 
+# Object types that can carry a Subdivision Surface modifier
+SUBSURF_OBJECT_TYPES = {'MESH', 'CURVE', 'SURFACE', 'FONT'}
+
 class NoSubdiv(bpy.types.Operator):
     """Remove all subdivision surface modifiers from objects"""
     bl_idname = "bst.no_subdiv"
@@ -18,12 +21,18 @@ class NoSubdiv(bpy.types.Operator):
             objects = context.selected_objects
         else:
             objects = bpy.data.objects
+        # Skip lights, cameras, empties etc. before touching their modifier stacks
+        objects = [obj for obj in objects if obj.type in SUBSURF_OBJECT_TYPES]
         removed_count = 0
         for obj in objects:
-            if obj.modifiers:
-                subdiv_mods = [mod for mod in obj.modifiers if mod.type == 'SUBSURF']
-                for mod in subdiv_mods:
-                    obj.modifiers.remove(mod)
+            mods = obj.modifiers
+            if not mods:
+                continue
+            # Walk the stack backwards so removals don't shift the indices still to visit
+            for i in range(len(mods) - 1, -1, -1):
+                mod = mods[i]
+                if mod.type == 'SUBSURF':
+                    mods.remove(mod)
                     removed_count += 1
         self.report({'INFO'}, f"Subdivision Surface modifiers removed from {'selected' if self.only_selected else 'all'} objects. ({removed_count} removed)")
         return {'FINISHED'}
@@ -74,7 +74,7 @@ class RBST_RenameImg_OT_Rename_images_by_mat(bpy.types.Operator):
 
     def execute(self, context):
         # Get selected images
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
+        selected_images = [img for img in bpy.data.images if img.bst_selected]
         
         if not selected_images:
             self.report({'WARNING'}, "No images selected for renaming")
@@ -1,41 +1,73 @@
 import bpy
 import bmesh
+import numpy as np
 from mathutils import Color
 
+# Two-digit uppercase hex for every 8-bit channel value
+_HEX_BYTES = tuple(f"{i:02X}" for i in range(256))
+
+def _to_byte(x):
+    """Round a 0-1 channel value to 0-255 (half up), clamped for HDR/negative values."""
+    return min(255, max(0, int(x * 255 + 0.5)))
+
 def rgb_to_hex(r, g, b, a=1.0):
     """Convert RGBA values (0-1 range) to hex color code."""
-    # Convert to 0-255 range and format as hex
-    r_int = int(round(r * 255))
-    g_int = int(round(g * 255))
-    b_int = int(round(b * 255))
-    a_int = int(round(a * 255))
+    # Convert to 0-255 range and look up the two-digit hex for each channel
+    hex_rgb = "#" + _HEX_BYTES[_to_byte(r)] + _HEX_BYTES[_to_byte(g)] + _HEX_BYTES[_to_byte(b)]
     
     # If alpha is full (255), use RGB format, otherwise use RGBA
+    a_int = _to_byte(a)
     if a_int == 255:
-        return f"#{r_int:02X}{g_int:02X}{b_int:02X}"
+        return hex_rgb
     else:
-        return f"#{r_int:02X}{g_int:02X}{b_int:02X}{a_int:02X}"
+        return hex_rgb + _HEX_BYTES[a_int]
+
+# Number of evenly spaced pixels probed before a full flat-color scan
+EARLY_REJECT_SAMPLES = 64
+
+# Images above this many megapixels are skipped without reading their pixels (0 = no limit)
+DEFAULT_MAX_MEGAPIXELS = 0
+
+def max_total_pixels_for(max_megapixels):
+    """Convert a megapixel limit into the pixel count is_flat_color_image_efficient takes."""
+    return max_megapixels * 1000000 if max_megapixels > 0 else None
+
+def exceeds_max_megapixels(width, height, max_megapixels):
+    """Whether an image is over the megapixel limit (always False when there is no limit)."""
+    max_total_pixels = max_total_pixels_for(max_megapixels)
+    return max_total_pixels is not None and width * height > max_total_pixels
 
-def is_flat_color_image_efficient(image, max_pixels_to_check=10000):
+# Pixel buffer reused across images during a scan, grown to the largest image seen
+_pixel_buffer = None
+
+def get_pixels(image, count):
+    """Read the first `count` pixel floats of an image into the shared scan buffer."""
+    global _pixel_buffer
+    if _pixel_buffer is None or _pixel_buffer.size < count:
+        _pixel_buffer = np.empty(count, dtype=np.float32)
+    pixels = _pixel_buffer[:count]
+    image.pixels.foreach_get(pixels)
+    return pixels
+
+def release_pixel_buffer():
+    """Free the shared scan buffer once a scan is finished."""
+    global _pixel_buffer
+    _pixel_buffer = None
+
+def is_flat_color_image_efficient(image, max_pixels_to_check=10000, max_total_pixels=None):
     """
     Efficiently check if an image has all pixels of the same color.
     
     Args:
         image: The image to check
         max_pixels_to_check: Maximum number of pixels to check (for performance)
+        max_total_pixels: Skip images larger than this many pixels without reading them (None = no limit)
     
     Returns:
         tuple: (is_flat, color) where is_flat is bool and color is RGBA tuple
     """
-    if not image or not image.pixels:
-        print(f"    DEBUG: No image or no pixels")
-        return False, None
-    
-    # Get pixel data
-    pixels = image.pixels[:]
-    
-    if len(pixels) == 0:
-        print(f"    DEBUG: Empty pixel array")
+    if not image:
+        print(f"    DEBUG: No image")
         return False, None
     
     # Images in Blender are typically RGBA, so 4 values per pixel
@@ -44,13 +76,41 @@ def is_flat_color_image_efficient(image, max_pixels_to_check=10000):
         print(f"    DEBUG: Unsupported channels: {channels}")
         return False, None
     
+    # Calculate total pixels from the image size before touching the pixel buffer
+    width, height = image.size
+    total_pixels = width * height
+    if total_pixels == 0:
+        print(f"    DEBUG: Empty pixel array")
+        return False, None
+    print(f"    DEBUG: Total pixels: {total_pixels}")
+    
+    if max_total_pixels is not None and total_pixels > max_total_pixels:
+        print(f"    DEBUG: Image too large to scan ({width}x{height})")
+        return False, None
+    
+    # A single pixel is trivially a flat color
+    if total_pixels == 1:
+        color = tuple(get_pixels(image, channels).tolist())
+        if channels == 3:
+            color += (1.0,)
+        print(f"    DEBUG: Single pixel image, color: {color}")
+        return True, color
+    
+    # Get pixel data straight into the shared NumPy buffer, one row per pixel
+    pixels = get_pixels(image, total_pixels * channels).reshape(-1, channels)
+    
     # Get the first pixel color as reference
-    first_pixel = pixels[:channels]
-    print(f"    DEBUG: Reference color: {first_pixel}")
+    first_pixel = pixels[0]
+    print(f"    DEBUG: Reference color: {tuple(first_pixel.tolist())}")
     
-    # Calculate total pixels
-    total_pixels = len(pixels) // channels
-    print(f"    DEBUG: Total pixels: {total_pixels}")
+    # Cheap early reject: compare a few evenly spaced pixels before the full
+    # comparison, since most images are clearly not a flat color. (Probing
+    # image.pixels directly would not help: every index or slice access makes
+    # Blender copy the whole buffer, so it is read once above instead.)
+    probe_step = max(1, total_pixels // EARLY_REJECT_SAMPLES)
+    if (pixels[::probe_step] != first_pixel).any():
+        print(f"    DEBUG: Sampled pixels differ from the reference color (early reject)")
+        return False, None
     
     # Determine how many pixels to check
     pixels_to_check = min(total_pixels, max_pixels_to_check)
@@ -64,32 +124,26 @@ def is_flat_color_image_efficient(image, max_pixels_to_check=10000):
         step = total_pixels // pixels_to_check
         print(f"    DEBUG: Sampling {pixels_to_check} pixels with step {step}")
     
-    # Check pixels
-    checked_count = 0
-    for i in range(0, total_pixels, step):
-        pixel_start = i * channels
-        current_pixel = pixels[pixel_start:pixel_start + channels]
-        checked_count += 1
-        
-        # Compare with reference pixel (exact match)
-        for j in range(channels):
-            if current_pixel[j] != first_pixel[j]:
-                print(f"    DEBUG: Pixel {i} differs at channel {j}: {current_pixel[j]} vs {first_pixel[j]}")
-                print(f"    DEBUG: Checked {checked_count} pixels before finding difference")
-                return False, None
+    # Compare every checked pixel with the reference pixel in one pass (exact match)
+    differs = (pixels[::step] != first_pixel).any(axis=1)
+    if differs.any():
+        print(f"    DEBUG: Pixel {int(differs.argmax()) * step} differs from the reference color")
+        return False, None
     
-    print(f"    DEBUG: All {checked_count} checked pixels are identical")
+    print(f"    DEBUG: All {len(differs)} checked pixels are identical")
     
     # If we get here, all checked pixels are the same color
+    first_pixel = first_pixel.tolist()
     if channels == 3:
         return True, (first_pixel[0], first_pixel[1], first_pixel[2], 1.0)
     else:
         return True, tuple(first_pixel)
 
-def is_flat_color_image(image):
+def is_flat_color_image(image, max_megapixels=DEFAULT_MAX_MEGAPIXELS):
     """Check if an image has all pixels of the same color."""
     # Use the efficient version by default
-    return is_flat_color_image_efficient(image, max_pixels_to_check=10000)
+    return is_flat_color_image_efficient(image, max_pixels_to_check=10000,
+                                         max_total_pixels=max_total_pixels_for(max_megapixels))
 
 def safe_rename_image(image, new_name):
     """Safely rename an image datablock using context override."""
@@ -130,42 +184,65 @@ def safe_rename_image(image, new_name):
                 except:
                     return False
 
-def rename_flat_color_textures():
-    """Main function to find and rename flat color textures."""
+def rename_flat_color_textures(skip_unloaded=False, max_megapixels=DEFAULT_MAX_MEGAPIXELS):
+    """Main function to find and rename flat color textures.
+    
+    Images whose pixels aren't loaded are read from disk to be checked, unless
+    skip_unloaded is set, in which case they are skipped and counted. Images
+    larger than max_megapixels are not checked (0 = no limit).
+    """
     renamed_count = 0
     failed_count = 0
     processed_count = 0
+    unloaded_count = 0
+    oversized_count = 0
     
     print("Scanning for flat color textures...")
     
     # Store rename operations to perform them in batch
     rename_operations = []
     
-    for image in bpy.data.images:
-        processed_count += 1
-        
-        # Skip if image has no pixel data
-        if not hasattr(image, 'pixels') or len(image.pixels) == 0:
-            print(f"Skipping '{image.name}': No pixel data available")
-            continue
-        
-        # Check if image has flat color
-        is_flat, color = is_flat_color_image(image)
-        
-        if is_flat and color:
-            # Convert color to hex
-            hex_color = rgb_to_hex(*color)
+    try:
+        for image in bpy.data.images:
+            processed_count += 1
+            
+            # Optionally skip images that would have to be read from disk first
+            if skip_unloaded and not image.has_data:
+                print(f"Skipping '{image.name}': Not loaded")
+                unloaded_count += 1
+                continue
+            
+            # Skip if image has no pixel data (reading the size loads the image if needed)
+            width, height = image.size
+            if width * height == 0:
+                print(f"Skipping '{image.name}': No pixel data available")
+                continue
             
-            # Store original name for logging
-            original_name = image.name
+            # Skip images over the size limit without reading their pixels
+            if exceeds_max_megapixels(width, height, max_megapixels):
+                print(f"Skipping '{image.name}': Larger than {max_megapixels} megapixels ({width}x{height})")
+                oversized_count += 1
+                continue
             
-            # Check if name is already a hex color (to avoid renaming again)
-            if not original_name.startswith('#'):
-                rename_operations.append((image, original_name, hex_color, color))
+            # Check if image has flat color
+            is_flat, color = is_flat_color_image(image, max_megapixels)
+            
+            if is_flat and color:
+                # Convert color to hex
+                hex_color = rgb_to_hex(*color)
+                
+                # Store original name for logging
+                original_name = image.name
+                
+                # Check if name is already a hex color (to avoid renaming again)
+                if not original_name.startswith('#'):
+                    rename_operations.append((image, original_name, hex_color, color))
+                else:
+                    print(f"Skipping '{original_name}': Already appears to be hex-named")
             else:
-                print(f"Skipping '{original_name}': Already appears to be hex-named")
-        else:
-            print(f"'{image.name}': Not a flat color texture")
+                print(f"'{image.name}': Not a flat color texture")
+    finally:
+        release_pixel_buffer()
     
     # Perform rename operations
     print(f"\nPerforming {len(rename_operations)} rename operation(s)...")
@@ -181,6 +258,10 @@ def rename_flat_color_textures():
     
     print(f"\nSummary:")
     print(f"Processed: {processed_count} images")
+    if unloaded_count > 0:
+        print(f"Skipped (not loaded): {unloaded_count} images")
+    if oversized_count > 0:
+        print(f"Skipped (over {max_megapixels} megapixels): {oversized_count} images")
     print(f"Successfully renamed: {renamed_count} flat color textures")
     if failed_count > 0:
         print(f"Failed to rename: {failed_count} textures (try running from Python Console instead)")
@@ -200,21 +281,33 @@ def reload_image_pixels():
                 print(f"Failed to reload: {image.name}")
 
 # Alternative function for running in restricted contexts
-def print_rename_suggestions():
+def print_rename_suggestions(skip_unloaded=False, max_megapixels=DEFAULT_MAX_MEGAPIXELS):
     """Print suggested renames without actually renaming (for restricted contexts)."""
     suggestions = []
+    unloaded_count = 0
+    oversized_count = 0
     
     print("Scanning for flat color textures (suggestion mode)...")
     
-    for image in bpy.data.images:
-        if not hasattr(image, 'pixels') or len(image.pixels) == 0:
-            continue
-        
-        is_flat, color = is_flat_color_image(image)
-        
-        if is_flat and color and not image.name.startswith('#'):
-            hex_color = rgb_to_hex(*color)
-            suggestions.append((image.name, hex_color, color))
+    try:
+        for image in bpy.data.images:
+            if skip_unloaded and not image.has_data:
+                unloaded_count += 1
+                continue
+            width, height = image.size
+            if width * height == 0:
+                continue
+            if exceeds_max_megapixels(width, height, max_megapixels):
+                oversized_count += 1
+                continue
+            
+            is_flat, color = is_flat_color_image(image, max_megapixels)
+            
+            if is_flat and color and not image.name.startswith('#'):
+                hex_color = rgb_to_hex(*color)
+                suggestions.append((image.name, hex_color, color))
+    finally:
+        release_pixel_buffer()
     
     if suggestions:
         print(f"\nFound {len(suggestions)} flat color texture(s) that could be renamed:")
@@ -227,6 +320,11 @@ def print_rename_suggestions():
         print("2. Command line with: blender file.blend --python script.py")
     else:
         print("\nNo flat color textures found that need renaming.")
+    
+    if unloaded_count > 0:
+        print(f"Skipped {unloaded_count} image(s) whose pixels weren't loaded")
+    if oversized_count > 0:
+        print(f"Skipped {oversized_count} image(s) over {max_megapixels} megapixels")
 
 # Main execution
 if __name__ == "__main__":
@@ -29,19 +29,26 @@ class RemoveCustomSplitNormals(bpy.types.Operator):
             objects = [obj for obj in bpy.data.objects if obj.type == 'MESH' and obj.name in view_layer_object_names]
 
         processed_count = 0
+        to_smooth = []
         for obj in objects:
-            mesh = obj.data
-            if mesh.has_custom_normals:
-                # Select and make active
-                obj.select_set(True)
-                context.view_layer.objects.active = obj
-                bpy.ops.object.mode_set(mode='EDIT')
-                bpy.ops.mesh.customdata_custom_splitnormals_clear()
+            if not obj.data.has_custom_normals:
+                continue
+            
+            # Leave Edit Mode once, up front; the clear operator works on the
+            # context object in Object Mode, so no per-object mode round-trip is needed
+            if context.mode != 'OBJECT':
                 bpy.ops.object.mode_set(mode='OBJECT')
+            with context.temp_override(object=obj, active_object=obj):
+                bpy.ops.mesh.customdata_custom_splitnormals_clear()
+            to_smooth.append(obj)
+            processed_count += 1
+            self.report({'INFO'}, f"Removed custom split normals and applied smooth shading to: {obj.name}")
+
+        # Smooth every processed mesh with a single operator call
+        if to_smooth:
+            with context.temp_override(selected_editable_objects=to_smooth,
+                                       object=to_smooth[0], active_object=to_smooth[0]):
                 bpy.ops.object.shade_smooth()
-                obj.select_set(False)
-                processed_count += 1
-                self.report({'INFO'}, f"Removed custom split normals and applied smooth shading to: {obj.name}")
 
         # Restore original selection and active object
         context.view_layer.objects.active = original_active
@@ -1,57 +1,66 @@
 import bpy
+import re
+from collections import deque
 
-def find_node_distance_to_basecolor(node, visited=None):
-    """Find the shortest path distance from a node to any Base Color input"""
-    if visited is None:
-        visited = set()
-    
-    if node in visited:
-        return float('inf')
-    
-    visited.add(node)
-    
-    # If this is a Principled BSDF node, check if it has a Base Color input
-    if node.type == 'BSDF_PRINCIPLED':
-        for input in node.inputs:
-            if input.name == 'Base Color':
-                # If this input is connected, return 0 (we found our target)
-                if input.links:
-                    return 0
-                return float('inf')
+# Keywords to look for in image names (case insensitive), matched in one regex pass
+DIFFUSE_KEYWORDS = ['diffuse', 'basecolor', 'base_color', 'albedo', 'color']
+_DIFFUSE_KEYWORD_RE = re.compile('|'.join(map(re.escape, DIFFUSE_KEYWORDS)), re.IGNORECASE)
+
+def snapshot_links(node_tree):
+    """Group a node tree's links by target node in a single pass over node_tree.links"""
+    # socket.links scans every link in the tree on each access, so the graph
+    # is read once here and walked as plain Python data afterwards
+    upstream = {}
+    base_color_targets = []
+    for link in node_tree.links:
+        to_node = link.to_node
+        upstream.setdefault(to_node, []).append(link.from_node)
+        if to_node.type == 'BSDF_PRINCIPLED' and link.to_socket.name == 'Base Color':
+            base_color_targets.append(to_node)
+    return upstream, base_color_targets
+
+def find_basecolor_distances(node_tree):
+    """Map every node that feeds a connected Base Color to its shortest distance"""
+    # One multi-source breadth-first search backwards from every Principled BSDF
+    # with a connected Base Color, instead of a forward search per texture node
+    upstream, base_color_targets = snapshot_links(node_tree)
+    distances = dict.fromkeys(base_color_targets, 0)
+    queue = deque(distances)
     
-    # Check all outputs of this node
-    min_distance = float('inf')
-    for output in node.outputs:
-        for link in output.links:
-            # Recursively check connected nodes
-            distance = find_node_distance_to_basecolor(link.to_node, visited.copy())
-            if distance is not None and distance < min_distance:
-                min_distance = distance + 1
+    while queue:
+        current = queue.popleft()
+        distance = distances[current] + 1
+        for prev_node in upstream.get(current, ()):
+            if prev_node in distances:
+                continue
+            distances[prev_node] = distance
+            # Paths don't continue through another Principled BSDF
+            if prev_node.type != 'BSDF_PRINCIPLED':
+                queue.append(prev_node)
     
-    return min_distance if min_distance != float('inf') else None
+    return distances
 
-def find_connected_basecolor_texture(node_tree):
+def find_connected_basecolor_texture(node_tree, principled_nodes=None):
     """Find any image texture directly connected to a Base Color input"""
-    for node in node_tree.nodes:
-        if node.type == 'BSDF_PRINCIPLED':
-            base_color_input = node.inputs.get('Base Color')
-            if base_color_input and base_color_input.links:
-                # Get the node connected to Base Color
-                connected_node = base_color_input.links[0].from_node
-                # If it's an image texture, return it
-                if connected_node.type == 'TEX_IMAGE' and connected_node.image:
-                    return connected_node
+    if principled_nodes is None:
+        principled_nodes = [node for node in node_tree.nodes if node.type == 'BSDF_PRINCIPLED']
+    for node in principled_nodes:
+        base_color_input = node.inputs.get('Base Color')
+        if base_color_input and base_color_input.links:
+            # Get the node connected to Base Color
+            connected_node = base_color_input.links[0].from_node
+            # If it's an image texture, return it
+            if connected_node.type == 'TEX_IMAGE' and connected_node.image:
+                return connected_node
     return None
 
 def select_diffuse_nodes():
     # Get all materials in the blend file
     materials = bpy.data.materials
     
-    # Counter for found nodes
-    found_nodes = 0
-    
-    # Keywords to look for in image names (case insensitive)
-    keywords = ['diffuse', 'basecolor', 'base_color', 'albedo', 'color']
+    # Selections and log lines are collected during the scan and applied once afterwards
+    to_select = []
+    messages = []
     
     # Iterate through all materials
     for material in materials:
@@ -61,24 +70,27 @@ def select_diffuse_nodes():
             
         node_tree = material.node_tree
         
+        # Nothing can be found without a Principled BSDF, so skip the per-node work
+        principled_nodes = [node for node in node_tree.nodes if node.type == 'BSDF_PRINCIPLED']
+        if not principled_nodes:
+            continue
+        
         # First, try to find any image texture connected to Base Color
-        base_color_texture = find_connected_basecolor_texture(node_tree)
+        base_color_texture = find_connected_basecolor_texture(node_tree, principled_nodes)
         if base_color_texture:
-            node_tree.nodes.active = base_color_texture
-            base_color_texture.select = True
-            found_nodes += 1
-            print(f"Selected Base Color connected texture '{base_color_texture.image.name}' in material: {material.name}")
+            to_select.append((node_tree, base_color_texture))
+            messages.append(f"Selected Base Color connected texture '{base_color_texture.image.name}' in material: {material.name}")
             continue
         
         # If no direct connection found, fall back to name-based search
         matching_nodes = []
+        distances = find_basecolor_distances(node_tree)
         for node in node_tree.nodes:
             if node.type == 'TEX_IMAGE' and node.image:
                 # Check if the image name contains any of our keywords
-                image_name = node.image.name.lower()
-                if any(keyword in image_name for keyword in keywords):
+                if _DIFFUSE_KEYWORD_RE.search(node.image.name):
                     # Calculate distance to Base Color input
-                    distance = find_node_distance_to_basecolor(node)
+                    distance = distances.get(node)
                     if distance is not None:
                         matching_nodes.append((node, distance))
         
@@ -88,12 +100,17 @@ def select_diffuse_nodes():
             matching_nodes.sort(key=lambda x: x[1])
             selected_node = matching_nodes[0][0]
             
-            node_tree.nodes.active = selected_node
-            selected_node.select = True
-            found_nodes += 1
-            print(f"Selected named texture '{selected_node.image.name}' in material: {material.name} (distance to Base Color: {matching_nodes[0][1]})")
+            to_select.append((node_tree, selected_node))
+            messages.append(f"Selected named texture '{selected_node.image.name}' in material: {material.name} (distance to Base Color: {matching_nodes[0][1]})")
+    
+    # Apply all selections in one pass
+    for node_tree, node in to_select:
+        node_tree.nodes.active = node
+        node.select = True
     
-    print(f"\nTotal texture nodes selected: {found_nodes}")
+    if messages:
+        print("\n".join(messages))
+    print(f"\nTotal texture nodes selected: {len(to_select)}")
 
 # Only run if this script is run directly
 if __name__ == "__main__":
@@ -3,8 +3,16 @@ from bpy.types import Panel, Operator, PropertyGroup # type: ignore
 from bpy.props import StringProperty, BoolProperty, EnumProperty, PointerProperty, CollectionProperty # type: ignore
 import os
 import re
+import sys
+import functools
+import logging
+import time
+from itertools import compress, islice
+import numpy as np
 from ..utils import compat
 
+_log = logging.getLogger(__name__)
+
 class RBST_PathMan_OT_summary_dialog(bpy.types.Operator):
     """Show remove extensions operation summary"""
     bl_idname = "remove_ext.summary_dialog"
@@ -73,6 +81,19 @@ def get_image_paths(image_name):
     else:
         return (None, None)
 
+@functools.lru_cache(maxsize=1)
+def _blend_basename(filepath):
+    """
+    Get the blend file name without extension, memoized on the filepath
+    
+    Args:
+        filepath (str): The blend file path (bpy.data.filepath)
+        
+    Returns:
+        str: The file name without extension, or None if the file is unsaved
+    """
+    return os.path.splitext(os.path.basename(filepath))[0] if filepath else None
+
 def ensure_directory_for_path(path):
     """
     Ensure the directory for the provided path exists.
@@ -95,9 +116,9 @@ def get_image_extension(image):
     Returns:
         str: The file extension including the dot (e.g. '.png') or empty string if not found
     """
-    # Debug print statements
-    print(f"DEBUG: Getting extension for image: {image.name}")
-    print(f"DEBUG: Image file_format is: {image.file_format}")
+    # Debug logging (lazy-formatted, filtered out unless DEBUG is enabled)
+    _log.debug("Getting extension for image: %s", image.name)
+    _log.debug("Image file_format is: %s", image.file_format)
     
     # Use the file_format property
     format_map = {
@@ -115,11 +136,11 @@ def get_image_extension(image):
     
     if image.file_format in format_map:
         ext = format_map[image.file_format]
-        print(f"DEBUG: Matched format, using extension: {ext}")
+        _log.debug("Matched format, using extension: %s", ext)
         return ext
     
     # Default to no extension if we can't determine it
-    print(f"DEBUG: No matching format found, returning empty extension")
+    _log.debug("No matching format found, returning empty extension")
     return ''
 
 def set_image_paths(image_name, new_path, tile_paths=None):
@@ -137,50 +158,65 @@ def set_image_paths(image_name, new_path, tile_paths=None):
     Returns:
         bool: True if successful, False if image not found
     """
-    if image_name in bpy.data.images:
-        img = bpy.data.images[image_name]
-        ensure_directory_for_path(new_path)
-        
-        # Set the filepath properties
+    img = bpy.data.images.get(image_name)
+    if img is None:
+        return False
+    _apply_image_paths(img, new_path, tile_paths)
+    return True
+
+def _apply_image_paths(img, new_path, tile_paths=None):
+    """
+    Set filepath, filepath_raw, packed and UDIM tile paths on an image datablock
+    
+    Args:
+        img: The image datablock
+        new_path (str): The new path to assign
+        tile_paths (dict, optional): Mapping of UDIM tile numbers to filepaths
+    """
+    ensure_directory_for_path(new_path)
+    
+    # Set the filepath properties, skipping no-op writes since each one
+    # triggers Blender's filepath update (reload check, depsgraph tag)
+    if img.filepath != new_path:
         img.filepath = new_path
+    if img.filepath_raw != new_path:
         img.filepath_raw = new_path
-        
-        # For packed files, set the packed_file.filepath too
-        # This is the property shown in the UI and is what we need to set
-        # for proper handling of packed files
-        if img.packed_file:
+    
+    # For packed files, set the packed_file.filepath too
+    # This is the property shown in the UI and is what we need to set
+    # for proper handling of packed files
+    packed_file = img.packed_file
+    if packed_file and packed_file.filepath != new_path:
+        try:
+            # Try setting the property directly
+            # This might be read-only in some versions of Blender, 
+            # but we attempt it anyway based on the UI showing this property
+            packed_file.filepath = new_path
+        except Exception as e:
+            # If it fails, the original filepaths (img.filepath and img.filepath_raw)
+            # are still set, which is better than nothing
+            pass
+
+    # Support UDIM/tiled images
+    if tile_paths and hasattr(img, "tiles"):
+        for tile in img.tiles:
+            tile_number = str(getattr(tile, "number", "1001"))
+            tile_path = tile_paths.get(tile_number)
+            if not tile_path:
+                continue
+            if not hasattr(tile, "filepath"):
+                # Blender versions prior to 4.0 don't expose per-tile filepaths;
+                # rely on the UDIM template instead.
+                continue
+            ensure_directory_for_path(tile_path)
+            if tile.filepath == tile_path:
+                continue
             try:
-                # Try setting the property directly
-                # This might be read-only in some versions of Blender, 
-                # but we attempt it anyway based on the UI showing this property
-                img.packed_file.filepath = new_path
-            except Exception as e:
-                # If it fails, the original filepaths (img.filepath and img.filepath_raw)
-                # are still set, which is better than nothing
+                tile.filepath = tile_path
+            except AttributeError:
+                # Some builds still expose the attribute but keep it read-only.
                 pass
 
-        # Support UDIM/tiled images
-        if tile_paths and hasattr(img, "tiles"):
-            for tile in img.tiles:
-                tile_number = str(getattr(tile, "number", "1001"))
-                tile_path = tile_paths.get(tile_number)
-                if not tile_path:
-                    continue
-                if not hasattr(tile, "filepath"):
-                    # Blender versions prior to 4.0 don't expose per-tile filepaths;
-                    # rely on the UDIM template instead.
-                    continue
-                ensure_directory_for_path(tile_path)
-                try:
-                    tile.filepath = tile_path
-                except AttributeError:
-                    # Some builds still expose the attribute but keep it read-only.
-                    pass
-            
-        return True
-    else:
-        return False
-
 def bulk_remap_paths(mapping_dict):
     """
     Remap multiple paths at once
@@ -194,15 +230,141 @@ def bulk_remap_paths(mapping_dict):
     success_count = 0
     failed_list = []
     
+    # Fetch the valid names once instead of an RNA membership test per entry
+    images = bpy.data.images
+    valid_names = set(images.keys())
+    
     for image_name, new_path in mapping_dict.items():
-        success = set_image_paths(image_name, new_path)
-        if success:
-            success_count += 1
-        else:
+        if image_name not in valid_names:
             failed_list.append(image_name)
+            continue
+        # Most targets share the same directory prefix; intern so equal paths share one object
+        new_path = sys.intern(new_path)
+        _apply_image_paths(images[image_name], new_path)
+        success_count += 1
     
     return (success_count, failed_list)
 
+def _get_flagged_images():
+    """
+    Get the images flagged for bulk operations
+    
+    The selection flags are read in one foreach_get call and applied during a
+    single pass over the collection (indexing bpy.data.images by position walks
+    a linked list, so images are never looked up one index at a time).
+    
+    Returns:
+        list: Selected images (may be empty)
+    """
+    images = bpy.data.images
+    flags = np.empty(len(images), dtype=bool)
+    images.foreach_get("bst_selected", flags)
+    return list(compress(images, flags))
+
+def _get_selected_images():
+    """
+    Get the images flagged for bulk operations in a single pass
+    
+    Returns:
+        Selected images as a list, or the bpy.data.images collection itself if
+        none are selected. Callers that rename images or keep the result across
+        timer ticks must take a list() snapshot.
+    """
+    return _get_flagged_images() or bpy.data.images
+
+def _select_images(to_select):
+    """
+    Add images to the bulk selection, keeping existing selections
+    
+    Args:
+        to_select (set): Image datablocks to select. Objects rather than names,
+            so a linked image sharing a local image's name can't be confused with it
+        
+    Returns:
+        int: Number of images selected
+    """
+    images = bpy.data.images
+    selected = np.empty(len(images), dtype=bool)
+    images.foreach_get("bst_selected", selected)
+    for i, img in enumerate(images):
+        if img in to_select:
+            selected[i] = True
+    images.foreach_set("bst_selected", selected)
+    return len(to_select)
+
+def _images_selected_first():
+    """
+    Get all images with the selected ones first, keeping the original order within each group
+    
+    The ordering is a stable partition on the selection flags, read in one
+    foreach_get call and applied during a single pass over the collection,
+    instead of a Python-keyed sort over every image.
+    
+    Returns:
+        list: All images, selected first
+    """
+    images = bpy.data.images
+    flags = np.empty(len(images), dtype=bool)
+    images.foreach_get("bst_selected", flags)
+    selected, rest = [], []
+    for img, flag in zip(images, flags.tolist()):
+        (selected if flag else rest).append(img)
+    return selected + rest
+
+# Preview icon ids keyed by ID.session_uid, which is unique per session and survives renames
+_preview_icon_ids = {}
+
+def _get_preview_icon_id(img):
+    """
+    Get the preview icon id for an image, calling preview_ensure() only the first time
+    
+    Args:
+        img: The image datablock
+        
+    Returns:
+        int: The preview icon id
+    """
+    uid = img.session_uid
+    icon_id = _preview_icon_ids.get(uid)
+    if icon_id is None:
+        icon_id = img.preview_ensure().icon_id
+        _preview_icon_ids[uid] = icon_id
+    return icon_id
+
+# Number of images when the preview icon cache was last checked for deleted images
+_preview_icon_image_count = 0
+
+def _prune_preview_icon_ids():
+    """
+    Drop cached preview icon ids of deleted images
+    
+    Only does any work when the number of images has dropped since the last
+    check, or the cache holds more entries than there are images, since the
+    paged list only ever caches the rows it has drawn.
+    """
+    global _preview_icon_image_count
+    images = bpy.data.images
+    image_count = len(images)
+    dropped = image_count < _preview_icon_image_count
+    _preview_icon_image_count = image_count
+    if not _preview_icon_ids or not (dropped or len(_preview_icon_ids) > image_count):
+        return
+    live = {img.session_uid for img in images}
+    for uid in [uid for uid in _preview_icon_ids if uid not in live]:
+        del _preview_icon_ids[uid]
+
+def _count_selected_images():
+    """
+    Count the images flagged for bulk operations with a single RNA read
+    
+    Returns:
+        int: Number of selected images
+    """
+    images = bpy.data.images
+    flags = np.empty(len(images), dtype=bool)
+    images.foreach_get("bst_selected", flags)
+    return int(np.count_nonzero(flags))
+
 # Properties for path management
 class RBST_PathMan_PG_PathProperties(PropertyGroup):
     # Active image pointer
@@ -326,6 +488,38 @@ class RBST_PathMan_PG_PathProperties(PropertyGroup):
         description="Flag to cancel the current operation",
         default=False
     )
+    
+    # Flat color renaming
+    flat_color_skip_unloaded: bpy.props.BoolProperty(  # type: ignore
+        name="Skip Unloaded Images",
+        description="Skip images whose pixels aren't loaded yet instead of reading them from disk to check for a flat color",
+        default=False
+    )
+    
+    flat_color_max_megapixels: bpy.props.IntProperty(  # type: ignore
+        name="Max Megapixels",
+        description="Skip images larger than this many megapixels when looking for flat colors, without reading their pixels (0 = no limit)",
+        default=0,
+        min=0,
+        soft_max=200
+    )
+    
+    # Paged view of the image list so large files don't redraw thousands of rows
+    page_size: bpy.props.IntProperty(  # type: ignore
+        name="Page Size",
+        description="Maximum number of images shown in the list at once",
+        default=200,
+        min=20,
+        max=2000
+    )
+    
+    # 0-based; changed through bst.image_list_page, which keeps it within the page count
+    page_index: bpy.props.IntProperty(  # type: ignore
+        name="Page",
+        description="Page of the image list currently shown",
+        default=0,
+        min=0
+    )
 
 # Operator to remap a single datablock path
 class RBST_PathMan_OT_remap_path(Operator):
@@ -365,12 +559,8 @@ class RBST_PathMan_OT_remap_path(Operator):
             return {'CANCELLED'}
     
     def invoke(self, context, event):
-        # Use the path from properties
-        props = context.scene.bst_path_props
-        if props.use_smart_pathing:
-            self.new_path = props.smart_base_path
-        else:
-            self.new_path = props.new_path
+        # Use the base path from properties (smart pathing is the only pathing mode)
+        self.new_path = context.scene.bst_path_props.smart_base_path
         return context.window_manager.invoke_props_dialog(self)
 
 # Operator to toggle all image selections
@@ -387,12 +577,38 @@ class RBST_PathMan_OT_toggle_select_all(Operator):
     ) # type: ignore
     
     def execute(self, context):
-        # Apply the selection state to all images
-        for img in bpy.data.images:
-            img.bst_selected = self.select_state
+        # Apply the selection state to all images in a single RNA call
+        images = bpy.data.images
+        images.foreach_set("bst_selected", np.full(len(images), self.select_state, dtype=bool))
         
         return {'FINISHED'}
 
+# Operator to step through pages of the image list
+class RBST_PathMan_OT_image_list_page(Operator):
+    bl_idname = "bst.image_list_page"
+    bl_label = "Change Page"
+    bl_description = "Show another page of the image list"
+    bl_options = {'REGISTER'}
+    
+    delta: bpy.props.IntProperty(  # type: ignore
+        name="Delta",
+        description="Number of pages to move by",
+        default=1
+    )
+    
+    page_count: bpy.props.IntProperty(  # type: ignore
+        name="Page Count",
+        description="Number of pages in the list as currently drawn",
+        default=1,
+        min=1
+    )
+    
+    def execute(self, context):
+        props = context.scene.bst_path_props
+        last_page = self.page_count - 1
+        props.page_index = max(0, min(min(props.page_index, last_page) + self.delta, last_page))
+        return {'FINISHED'}
+
 # Operator to remap multiple paths at once
 class RBST_PathMan_OT_bulk_remap(Operator):
     bl_idname = "bst.bulk_remap"
@@ -417,7 +633,7 @@ class RBST_PathMan_OT_bulk_remap(Operator):
     
     def execute(self, context):
         # Get selected images
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
+        selected_images = _get_flagged_images()
         
         if not selected_images:
             self.report({'WARNING'}, "No images selected for remapping")
@@ -429,8 +645,17 @@ class RBST_PathMan_OT_bulk_remap(Operator):
         props.operation_progress = 0.0
         props.operation_status = f"Preparing to remap {len(selected_images)} images..."
         
+        # Build every target path up front (pure string work) so the timer
+        # only has to perform the RNA assignments.
+        # The directory prefix is the same for every image, so build it once
+        path_prefix = get_path_prefix(context)
+        remap_targets = []
+        for img in selected_images:
+            name = img.name
+            remap_targets.append((name, path_prefix + name + get_image_extension(img)))
+        
         # Store data for timer processing
-        self.selected_images = selected_images
+        self.remap_targets = remap_targets
         self.current_index = 0
         self.remap_count = 0
         
@@ -450,7 +675,7 @@ class RBST_PathMan_OT_bulk_remap(Operator):
             props.cancel_operation = False
             return None
         
-        if self.current_index >= len(self.selected_images):
+        if self.current_index >= len(self.remap_targets):
             # Operation complete
             props = bpy.context.scene.bst_path_props
             props.is_operation_running = False
@@ -464,25 +689,19 @@ class RBST_PathMan_OT_bulk_remap(Operator):
             return None
         
         # Process next image
-        img = self.selected_images[self.current_index]
+        image_name, full_path = self.remap_targets[self.current_index]
         
         # Update status
         props = bpy.context.scene.bst_path_props
-        props.operation_status = f"Remapping {img.name}..."
-        
-        # Get file extension for this image
-        extension = get_image_extension(img)
+        props.operation_status = f"Remapping {image_name}..."
         
-        # Get the combined path
-        full_path = get_combined_path(bpy.context, img.name, extension)
-        
-        success = set_image_paths(img.name, full_path)
+        success = set_image_paths(image_name, full_path)
         if success:
             self.remap_count += 1
         
         # Update progress
         self.current_index += 1
-        progress = (self.current_index / len(self.selected_images)) * 100.0
+        progress = (self.current_index / len(self.remap_targets)) * 100.0
         props.operation_progress = progress
         
         # Force UI update
@@ -552,12 +771,9 @@ class RBST_PathMan_OT_select_material_images(Operator):
             
             node_tree = context.space_data.node_tree
             
-            # Find all image texture nodes in the current material
-            for node in node_tree.nodes:
-                if node.type == 'TEX_IMAGE' and node.image:
-                    # Select this image
-                    node.image.bst_selected = True
-                    selected_count += 1
+            # Find all image texture nodes in the current material and select their images
+            selected_count = _select_images({node.image for node in node_tree.nodes
+                                          if node.type == 'TEX_IMAGE' and node.image})
             
             if selected_count > 0:
                 self.report({'INFO'}, f"Selected {selected_count} images from material")
@@ -586,12 +802,9 @@ class RBST_PathMan_OT_select_active_images(Operator):
             
             node_tree = context.space_data.node_tree
             
-            # Find all selected image texture nodes
-            for node in node_tree.nodes:
-                if node.select and node.type == 'TEX_IMAGE' and node.image:
-                    # Select this image
-                    node.image.bst_selected = True
-                    selected_count += 1
+            # Find all selected image texture nodes and select their images
+            selected_count = _select_images({node.image for node in node_tree.nodes
+                                          if node.select and node.type == 'TEX_IMAGE' and node.image})
             
             if selected_count > 0:
                 self.report({'INFO'}, f"Selected {selected_count} images from active nodes")
@@ -621,29 +834,23 @@ class RBST_PathMan_OT_select_absolute_images(Operator):
                 continue
             
             # Check if image has a file path
-            if not img.filepath and not img.filepath_raw:
+            filepath = img.filepath
+            filepath_raw = img.filepath_raw
+            if not filepath and not filepath_raw:
                 continue
             
-            # Check both filepath and filepath_raw for absolute paths
+            # Check both filepath and filepath_raw for absolute paths.
+            # Blender relative paths (starting with //) are skipped, and bpy.path.abspath
+            # leaves every other path unchanged, so os.path.isabs can check it directly.
             is_absolute = False
             
             # Check filepath
-            if img.filepath:
-                # Skip Blender relative paths (starting with //)
-                if not img.filepath.startswith('//'):
-                    # Convert to absolute path and check
-                    abs_path = bpy.path.abspath(img.filepath)
-                    if abs_path and os.path.isabs(abs_path):
-                        is_absolute = True
+            if filepath and not filepath.startswith('//'):
+                is_absolute = os.path.isabs(filepath)
             
             # Check filepath_raw if filepath wasn't absolute
-            if not is_absolute and img.filepath_raw:
-                # Skip Blender relative paths (starting with //)
-                if not img.filepath_raw.startswith('//'):
-                    # Convert to absolute path and check
-                    abs_path = bpy.path.abspath(img.filepath_raw)
-                    if abs_path and os.path.isabs(abs_path):
-                        is_absolute = True
+            if not is_absolute and filepath_raw and not filepath_raw.startswith('//'):
+                is_absolute = os.path.isabs(filepath_raw)
             
             # Select image if it has an absolute path
             if is_absolute:
@@ -692,7 +899,7 @@ class RBST_PathMan_OT_rename_datablock(Operator):
             return {'CANCELLED'}
         
         # Check if the datablock is linked
-        if hasattr(datablock, 'library') and datablock.library is not None:
+        if datablock.library is not None:
             self.report({'ERROR'}, "Cannot rename linked image")
             return {'CANCELLED'}
         
@@ -730,24 +937,31 @@ class RBST_PathMan_OT_toggle_image_selection(Operator):
         # If shift is held and we have a previous selection
         if event.shift and last_selected and last_selected in bpy.data.images:
             # Get indices of current and last selected images
-            image_list = list(bpy.data.images)
+            images = bpy.data.images
             current_idx = -1
             last_idx = -1
             
-            for i, image in enumerate(image_list):
-                if image.name == self.image_name:
+            for i, image in enumerate(images):
+                name = image.name
+                if name == self.image_name:
                     current_idx = i
-                if image.name == last_selected:
+                if name == last_selected:
                     last_idx = i
+                # Stop scanning as soon as both ends of the range are known
+                if current_idx >= 0 and last_idx >= 0:
+                    break
             
             # Select all images between last selected and current
             if current_idx >= 0 and last_idx >= 0:
                 start_idx = min(current_idx, last_idx)
                 end_idx = max(current_idx, last_idx)
                 
-                for i in range(start_idx, end_idx + 1):
-                    # Ensure all images in range are selected
-                    image_list[i].bst_selected = True
+                # Ensure all images in range are selected with one flag read and write
+                # (indexing images by position walks the collection's linked list)
+                flags = np.empty(len(images), dtype=bool)
+                images.foreach_get("bst_selected", flags)
+                flags[start_idx:end_idx + 1] = True
+                images.foreach_set("bst_selected", flags)
             
         else:
             # Toggle the current image's selection
@@ -778,10 +992,8 @@ class RBST_PathMan_OT_reuse_material_path(Operator):
               context.space_data.tree_type == 'ShaderNodeTree' and
               context.space_data.node_tree):
             node_tree_name = context.space_data.node_tree.name
-            if node_tree_name in bpy.data.materials:
-                material_name = bpy.data.materials[node_tree_name].name
-            else:
-                material_name = node_tree_name
+            mat = bpy.data.materials.get(node_tree_name)
+            material_name = mat.name if mat is not None else node_tree_name
         
         if material_name:
             # Update the material subfolder field
@@ -801,11 +1013,8 @@ class RBST_PathMan_OT_reuse_blend_name(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        blend_name = None
         # Try to get the current blend filename without extension
-        blend_path = bpy.data.filepath
-        if blend_path:
-            blend_name = os.path.splitext(os.path.basename(blend_path))[0]
+        blend_name = _blend_basename(bpy.data.filepath)
         
         if blend_name:
             # Set the blend subfolder
@@ -852,25 +1061,25 @@ class RBST_PathMan_OT_pack_images(Operator):
         failed_count = 0
         
         # Get all selected images or all images if none selected
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
-        if not selected_images:
-            selected_images = list(bpy.data.images)
+        selected_images = _get_selected_images()
         
         for img in selected_images:
+            name = img.name
             # Skip images that can't or shouldn't be packed
-            if (img.packed_file or  # Already packed
-                img.source == 'GENERATED' or  # Procedurally generated
-                img.source == 'VIEWER' or  # Render Result, Viewer Node, etc.
+            source = img.source
+            if (img.packed_file is not None or  # Already packed
+                source == 'GENERATED' or  # Procedurally generated
+                source == 'VIEWER' or  # Render Result, Viewer Node, etc.
                 not img.filepath or  # No file path
-                img.name in ['Render Result', 'Viewer Node']):  # Special Blender images
+                name in ['Render Result', 'Viewer Node']):  # Special Blender images
                 continue
                 
             try:
-                print(f"DEBUG: Packing image: {img.name}")
+                _log.debug("Packing image: %s", name)
                 img.pack()
                 packed_count += 1
             except Exception as e:
-                print(f"DEBUG: Failed to pack {img.name}: {str(e)}")
+                _log.debug("Failed to pack %s: %s", name, e)
                 failed_count += 1
         
         if packed_count > 0:
@@ -894,18 +1103,17 @@ class RBST_PathMan_OT_unpack_images(Operator):
         failed_count = 0
         
         # Get all selected images or all images if none selected
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
-        if not selected_images:
-            selected_images = list(bpy.data.images)
+        selected_images = _get_selected_images()
         
         for img in selected_images:
-            if img.packed_file:
+            if img.packed_file is not None:
+                name = img.name
                 try:
-                    print(f"DEBUG: Unpacking image: {img.name} (USE_LOCAL)")
+                    _log.debug("Unpacking image: %s (USE_LOCAL)", name)
                     img.unpack(method='USE_LOCAL')
                     unpacked_count += 1
                 except Exception as e:
-                    print(f"DEBUG: Failed to unpack {img.name}: {str(e)}")
+                    _log.debug("Failed to unpack %s: %s", name, e)
                     failed_count += 1
         
         if unpacked_count > 0:
@@ -929,18 +1137,17 @@ class RBST_PathMan_OT_remove_packed_images(Operator):
         failed_count = 0
         
         # Get all selected images or all images if none selected
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
-        if not selected_images:
-            selected_images = list(bpy.data.images)
+        selected_images = _get_selected_images()
         
         for img in selected_images:
-            if img.packed_file:
+            if img.packed_file is not None:
+                name = img.name
                 try:
-                    print(f"DEBUG: Removing packed data for image: {img.name}")
+                    _log.debug("Removing packed data for image: %s", name)
                     img.unpack(method='REMOVE')
                     removed_count += 1
                 except Exception as e:
-                    print(f"DEBUG: Failed to remove packed data for {img.name}: {str(e)}")
+                    _log.debug("Failed to remove packed data for %s: %s", name, e)
                     failed_count += 1
         
         if removed_count > 0:
@@ -959,11 +1166,13 @@ class RBST_PathMan_OT_save_all_images(Operator):
     bl_description = "Save all selected images to image paths"
     bl_options = {'REGISTER', 'UNDO'}
     
+    # Seconds of saving per timer tick before yielding back to the UI
+    batch_time_budget = 0.1
+    
     def execute(self, context):
         # Get all selected images or all images if none selected
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
-        if not selected_images:
-            selected_images = list(bpy.data.images)
+        # (snapshot, since the list is indexed across timer ticks)
+        selected_images = list(_get_selected_images())
         
         if not selected_images:
             self.report({'WARNING'}, "No images to save")
@@ -980,6 +1189,8 @@ class RBST_PathMan_OT_save_all_images(Operator):
         self.current_index = 0
         self.saved_count = 0
         self.failed_count = 0
+        # Image editor used by the fallback save path, looked up once for the whole run
+        self.image_editor_area = next((area for area in context.screen.areas if area.type == 'IMAGE_EDITOR'), None)
         
         # Start timer for processing
         bpy.app.timers.register(self._process_batch)
@@ -1010,53 +1221,67 @@ class RBST_PathMan_OT_save_all_images(Operator):
             
             return None
         
-        # Process next image
-        img = self.selected_images[self.current_index]
+        # Save as many images as fit in the time budget before yielding back to the UI.
+        # bpy is not thread-safe, so saves stay on the main thread; batching removes
+        # the fixed 50ms idle gap that otherwise separates every single save.
+        deadline = time.perf_counter() + self.batch_time_budget
+        while True:
+            img = self.selected_images[self.current_index]
+            
+            # Update status
+            props.operation_status = f"Saving {img.name}..."
+            
+            self._save_image(img)
+            
+            self.current_index += 1
+            if self.current_index >= len(self.selected_images) or time.perf_counter() >= deadline:
+                break
         
-        # Update status
-        props = bpy.context.scene.bst_path_props
-        props.operation_status = f"Saving {img.name}..."
+        # Update progress
+        progress = (self.current_index / len(self.selected_images)) * 100.0
+        props.operation_progress = progress
         
+        # Force UI update
+        for area in bpy.context.screen.areas:
+            area.tag_redraw()
+        
+        # Continue processing with shorter intervals for better responsiveness
+        return 0.05  # Process next batch in 0.05 seconds (50ms) for better stability
+    
+    def _save_image(self, img):
+        """Save a single image, updating the saved/failed counters"""
         try:
             # Try to save using available methods
             if hasattr(img, 'save'):
                 # Try direct save method first
                 img.save()
                 self.saved_count += 1
+            elif self.image_editor_area:
+                # Alternative method - use the image editor found at invoke time
+                area = self.image_editor_area
+                space = area.spaces.active
+                
+                # Set the active image
+                space.image = img
+                
+                # Try to save with a context override (dict overrides were removed in Blender 4.0)
+                with bpy.context.temp_override(area=area, space_data=space, region=area.regions[0]):
+                    bpy.ops.image.save()
+                self.saved_count += 1
             else:
-                # Alternative method - try to find an image editor space
-                for area in bpy.context.screen.areas:
-                    if area.type == 'IMAGE_EDITOR':
-                        # Found an image editor, use it to save the image
-                        override = bpy.context.copy()
-                        override['area'] = area
-                        override['space_data'] = area.spaces.active
-                        override['region'] = area.regions[0]
-                        
-                        # Set the active image
-                        area.spaces.active.image = img
-                        
-                        # Try to save with override
-                        bpy.ops.image.save(override)
-                        self.saved_count += 1
-                        break
-                else:
-                    # No image editor found
-                    self.failed_count += 1
+                # No image editor found
+                self.failed_count += 1
         except Exception as e:
             self.failed_count += 1
-        
-        # Update progress
-        self.current_index += 1
-        progress = (self.current_index / len(self.selected_images)) * 100.0
-        props.operation_progress = progress
-        
-        # Force UI update
-        for area in bpy.context.screen.areas:
-            area.tag_redraw()
-        
-        # Continue processing with shorter intervals for better responsiveness
-        return 0.05  # Process next item in 0.05 seconds (50ms) for better stability
+
+# Common image extensions (lowercase), in the order they are tried
+_EXTENSIONS = ('.jpeg', '.jpg', '.png', '.tiff', '.tif', '.bmp',
+               '.exr', '.hdr', '.tga', '.jp2', '.webp')
+
+# Each extension matched anywhere in a name when followed by a dot or the end
+# (e.g. "wood.png.001"). The first extension in _EXTENSIONS that occurs wins, at
+# its first occurrence, so "x.jpg.png.001" loses ".jpg".
+_EXT_PATTERNS = tuple(re.compile(re.escape(ext) + r'(?=\.|$)', re.IGNORECASE) for ext in _EXTENSIONS)
 
 # Remove Extensions Operator
 class RBST_PathMan_OT_remove_extensions(Operator):
@@ -1071,46 +1296,51 @@ class RBST_PathMan_OT_remove_extensions(Operator):
         linked_count = 0
         removal_list = []  # Track removed extensions for debug
         
-        # Common image extensions to remove (ordered by specificity)
-        extensions = ['.jpeg', '.jpg', '.png', '.tiff', '.tif', '.bmp', 
-                      '.exr', '.hdr', '.tga', '.jp2', '.webp']
-        
         # Get all selected images or all images if none selected
-        selected_images = [img for img in bpy.data.images if hasattr(img, "bst_selected") and img.bst_selected]
-        if not selected_images:
-            selected_images = list(bpy.data.images)
+        # (snapshot, since renaming re-sorts bpy.data.images during iteration)
+        selected_images = list(_get_selected_images())
         
         for img in selected_images:
+            original_name = img.name
+            
             # Skip linked images
-            if hasattr(img, 'library') and img.library is not None:
+            if img.library is not None:
                 linked_count += 1
-                print(f"DEBUG: Skipped linked image: {img.name}")
+                _log.debug("Skipped linked image: %s", original_name)
                 continue
                 
-            original_name = img.name
             extension_removed = None
             
-            # Look for extensions anywhere in the filename, not just at the end
-            for ext in extensions:
-                # Use regex to find extension followed by optional additional content
-                pattern = rf'({re.escape(ext)})(?=\.|$|\.[\d]+$)'
-                match = re.search(pattern, img.name, re.IGNORECASE)
-                if match:
-                    # Remove the extension but keep anything after it
-                    new_name = img.name[:match.start(1)] + img.name[match.end(1):]
-                    try:
-                        print(f"DEBUG: Removing extension {ext} from {img.name} → {new_name}")
-                        img.name = new_name
-                        removed_count += 1
-                        extension_removed = ext
-                        removal_list.append((original_name, new_name, ext))
-                        break  # Stop after finding the first matching extension
-                    except Exception as e:
-                        print(f"DEBUG: Failed to rename {img.name}: {str(e)}")
+            ext = None
+            if original_name.count('.') == 1:
+                # Most names have a single dot, so the suffix is the only candidate
+                stem, _, suffix = original_name.partition('.')
+                if '.' + suffix.lower() in _EXTENSIONS:
+                    ext = '.' + suffix
+                    new_name = stem
+            else:
+                # Look for extensions anywhere in the filename, not just at the end
+                for pattern in _EXT_PATTERNS:
+                    match = pattern.search(original_name)
+                    if match:
+                        # Remove the extension but keep anything after it
+                        ext = match.group()
+                        new_name = original_name[:match.start()] + original_name[match.end():]
+                        break
+            
+            if ext:
+                try:
+                    _log.debug("Removing extension %s from %s → %s", ext, original_name, new_name)
+                    img.name = new_name
+                    removed_count += 1
+                    extension_removed = ext
+                    removal_list.append((original_name, new_name, ext))
+                except Exception as e:
+                    _log.debug("Failed to rename %s: %s", original_name, e)
             
             if not extension_removed:
                 no_extension_count += 1
-                print(f"DEBUG: No extension found in: {img.name}")
+                _log.debug("No extension found in: %s", original_name)
         
         # Console debug summary (keep for development)
         print(f"\n=== REMOVE EXTENSIONS SUMMARY ===")
@@ -1119,13 +1349,14 @@ class RBST_PathMan_OT_remove_extensions(Operator):
         print(f"No extension found: {no_extension_count}")
         print(f"Linked images (skipped): {linked_count}")
         
-        if removal_list:
-            print(f"\nDetailed removal log:")
-            for original, new, ext in removal_list:
-                print(f"  '{original}' → '{new}' (removed {ext})")
-        
         print(f"==================================\n")
         
+        # Per-image detail is only formatted when debug logging is enabled
+        if removal_list and _log.isEnabledFor(logging.DEBUG):
+            _log.debug("Detailed removal log:")
+            for original, new, ext in removal_list:
+                _log.debug("  '%s' → '%s' (removed %s)", original, new, ext)
+        
         # Show popup summary dialog
         self.show_summary_dialog(context, len(selected_images), removed_count, no_extension_count, linked_count, removal_list)
         
@@ -1170,6 +1401,10 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
         self.failed_count = 0
         self.renaming_phase = False  # Initialize the renaming_phase attribute
         self.skipped_count = 0  # Track skipped images
+        self.unloaded_count = 0  # Images skipped because their pixels weren't loaded
+        self.oversized_count = 0  # Images skipped for being over the megapixel limit
+        self.skip_unloaded = props.flat_color_skip_unloaded
+        self.max_megapixels = props.flat_color_max_megapixels
         self._cancelled = False  # Internal cancellation flag
         
         # Processing settings for better performance
@@ -1185,7 +1420,28 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
         
         return {'FINISHED'}
     
+    def _skip_details(self):
+        """Breakdown of the skipped count for the status line, e.g. (2 not loaded, 1 too large)"""
+        details = []
+        if self.unloaded_count:
+            details.append(f"{self.unloaded_count} not loaded")
+        if self.oversized_count:
+            details.append(f"{self.oversized_count} too large")
+        return f" ({', '.join(details)})" if details else ""
+    
     def _process_batch(self):
+        """Timer callback: run one step and free the scan's pixel buffer however the timer ends"""
+        from ..ops.flat_color_texture_renamer import release_pixel_buffer
+        
+        interval = None
+        try:
+            interval = self._process_step()
+        finally:
+            if interval is None:
+                release_pixel_buffer()
+        return interval
+    
+    def _process_step(self):
         """Process images in batches to avoid blocking the UI"""
         # Check for cancellation - do this first and frequently
         if self._cancelled:
@@ -1215,7 +1471,7 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
                 props = bpy.context.scene.bst_path_props
                 props.is_operation_running = False
                 props.operation_progress = 100.0
-                props.operation_status = f"Completed! Scanned {len(self.images)} images, found {len(self.rename_operations)} flat colors, renamed {self.renamed_count}{f', {self.failed_count} failed' if self.failed_count > 0 else ''}, skipped {self.skipped_count}"
+                props.operation_status = f"Completed! Scanned {len(self.images)} images, found {len(self.rename_operations)} flat colors, renamed {self.renamed_count}{f', {self.failed_count} failed' if self.failed_count > 0 else ''}, skipped {self.skipped_count}{self._skip_details()}"
                 
                 # Console summary
                 print(f"\n=== FLAT COLOR DETECTION SUMMARY ===")
@@ -1224,6 +1480,10 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
                 print(f"Successfully renamed: {self.renamed_count}")
                 print(f"Failed to rename: {self.failed_count}")
                 print(f"Skipped images: {self.skipped_count}")
+                if self.skip_unloaded:
+                    print(f"  Not loaded: {self.unloaded_count}")
+                if self.max_megapixels > 0:
+                    print(f"  Over {self.max_megapixels} megapixels: {self.oversized_count}")
                 print(f"=====================================\n")
                 
                 # Force UI update
@@ -1232,7 +1492,9 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
                 
                 return None
             else:
-                # Start renaming phase
+                # Start renaming phase; the scan's shared pixel buffer is no longer needed
+                from ..ops.flat_color_texture_renamer import release_pixel_buffer
+                release_pixel_buffer()
                 self.renaming_phase = True
                 self.current_index = 0
                 props = bpy.context.scene.bst_path_props
@@ -1246,7 +1508,7 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
                     # No flat color textures found
                     props.is_operation_running = False
                     props.operation_progress = 100.0
-                    props.operation_status = f"Completed! Scanned {len(self.images)} images, found 0 flat colors, skipped {self.skipped_count}"
+                    props.operation_status = f"Completed! Scanned {len(self.images)} images, found 0 flat colors, skipped {self.skipped_count}{self._skip_details()}"
                     print(f"\n=== NO FLAT COLORS FOUND ===")
                     print(f"Scanned {len(self.images)} images but found no flat color textures to rename.")
                     return None
@@ -1257,37 +1519,48 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
         
         if not self.renaming_phase:
             # Scanning phase
+            name = img.name
             props = bpy.context.scene.bst_path_props
-            props.operation_status = f"Scanning {img.name} ({self.current_index + 1}/{len(self.images)}) - Found: {len(self.rename_operations)}, Skipped: {self.skipped_count}"
+            props.operation_status = f"Scanning {name} ({self.current_index + 1}/{len(self.images)}) - Found: {len(self.rename_operations)}, Skipped: {self.skipped_count}"
             
             # Console reporting for each image
-            print(f"\nScanning image {self.current_index + 1}/{len(self.images)}: '{img.name}'")
+            print(f"\nScanning image {self.current_index + 1}/{len(self.images)}: '{name}'")
             
-            # Debug image properties
+            # Debug image properties (size and channels are printed once the image is loaded)
             print(f"  Image properties:")
-            print(f"    Size: {img.size if hasattr(img, 'size') else 'N/A'}")
-            print(f"    Channels: {img.channels if hasattr(img, 'channels') else 'N/A'}")
             print(f"    Source: {img.source if hasattr(img, 'source') else 'N/A'}")
             print(f"    Filepath: {img.filepath if hasattr(img, 'filepath') else 'N/A'}")
-            print(f"    Has pixels: {hasattr(img, 'pixels') and len(img.pixels) > 0}")
-            if hasattr(img, 'pixels') and len(img.pixels) > 0:
-                print(f"    Pixel count: {len(img.pixels)}")
-                print(f"    Total pixels: {len(img.pixels) // img.channels if hasattr(img, 'channels') else 'N/A'}")
             
             # Quick pre-check: skip images that are unlikely to be flat colors
+            from ..ops.flat_color_texture_renamer import exceeds_max_megapixels
             skip_reasons = []
             
             # Skip if already hex-named
-            if img.name.startswith('#'):
+            if name.startswith('#'):
                 skip_reasons.append("already hex-named")
             
-            # Skip if no pixel data
-            if not hasattr(img, 'pixels') or len(img.pixels) == 0:
-                skip_reasons.append("no pixel data")
-            
-            # Skip if image is too small (likely not a texture)
-            elif hasattr(img, 'size') and img.size[0] * img.size[1] < 16:
-                skip_reasons.append("too small")
+            # Optionally skip images that would have to be read from disk first
+            if self.skip_unloaded and not img.has_data:
+                skip_reasons.append("not loaded")
+                self.unloaded_count += 1
+            else:
+                # Reading the size loads the image if needed
+                width, height = img.size
+                print(f"    Size: {width}x{height}")
+                print(f"    Channels: {img.channels}")
+                
+                # Skip if no pixel data
+                if width * height == 0:
+                    skip_reasons.append("no pixel data")
+                
+                # Skip if image is too small (likely not a texture)
+                elif width * height < 16:
+                    skip_reasons.append("too small")
+                
+                # Skip images over the size limit without reading their pixels
+                elif exceeds_max_megapixels(width, height, self.max_megapixels):
+                    skip_reasons.append(f"over {self.max_megapixels} megapixels")
+                    self.oversized_count += 1
             
             if skip_reasons:
                 # Skip this image
@@ -1297,28 +1570,29 @@ class RBST_PathMan_OT_rename_flat_colors(Operator):
                 # Process the image
                 try:
                     # Import the function here to avoid circular imports
-                    from ..ops.flat_color_texture_renamer import is_flat_color_image_efficient, rgb_to_hex
+                    from ..ops.flat_color_texture_renamer import is_flat_color_image_efficient, max_total_pixels_for, rgb_to_hex
                     
                     print(f"  Processing image...")
                     
                     # Use the new efficient detection function
-                    is_flat, color = is_flat_color_image_efficient(img, max_pixels_to_check=10000)
+                    is_flat, color = is_flat_color_image_efficient(img, max_pixels_to_check=10000,
+                                                                   max_total_pixels=max_total_pixels_for(self.max_megapixels))
                     
                     if is_flat and color:
                         # Convert color to hex
                         hex_color = rgb_to_hex(*color)
                         
                         # Check if name is already a hex color (to avoid renaming again)
-                        if not img.name.startswith('#'):
-                            self.rename_operations.append((img, img.name, hex_color, color))
-                            print(f"  FOUND FLAT COLOR: '{img.name}' -> '{hex_color}' (RGBA{color})")
+                        if not name.startswith('#'):
+                            self.rename_operations.append((img, name, hex_color, color))
+                            print(f"  FOUND FLAT COLOR: '{name}' -> '{hex_color}' (RGBA{color})")
                         else:
                             print(f"  SKIPPED: already hex-named")
                     else:
-                        print(f"  NOT A FLAT COLOR: {img.name}")
+                        print(f"  NOT A FLAT COLOR: {name}")
                 except Exception as e:
                     # Skip this image if there's an error
-                    print(f"  ERROR processing {img.name}: {str(e)}")
+                    print(f"  ERROR processing {name}: {str(e)}")
                     pass
         else:
             # Renaming phase
@@ -1368,6 +1642,94 @@ class RBST_PathMan_OT_cancel_operation(Operator):
         self.report({'INFO'}, "Operation cancellation requested")
         return {'FINISHED'}
 
+def _resolve_blend_subfolder(props):
+    """
+    Get the blend subfolder name, falling back to the blend file name
+    
+    Args:
+        props: The scene's bst_path_props
+        
+    Returns:
+        str: The subfolder name
+    """
+    # Try to get blend name if not specified
+    return props.blend_subfolder or _blend_basename(bpy.data.filepath) or "untitled"
+
+def _resolve_material_subfolder(props, context):
+    """
+    Get the material subfolder name, falling back to the active material
+    or the material being edited in the node editor
+    
+    Args:
+        props: The scene's bst_path_props
+        context: The current context
+        
+    Returns:
+        str: The subfolder name
+    """
+    subfolder = props.material_subfolder
+    if subfolder:
+        return subfolder
+    
+    # Try to get material name if not specified
+    material_name = None
+    # Try to get from active object
+    obj = context.active_object
+    material = obj.active_material if obj is not None else None
+    space = context.space_data
+    if material is not None:
+        material_name = material.name
+    # Fallback: try to get from node editor's node tree
+    elif (space is not None and space.type == 'NODE_EDITOR' and
+          space.tree_type == 'ShaderNodeTree' and
+          space.node_tree is not None):
+        node_tree_name = space.node_tree.name
+        mat = bpy.data.materials.get(node_tree_name)
+        material_name = mat.name if mat is not None else node_tree_name
+    
+    return material_name or "material"
+
+# Last prefix built by get_path_prefix, keyed on its resolved inputs
+_path_prefix_cache = {"key": None, "value": None}
+
+# Build the shared directory prefix for path construction
+def get_path_prefix(context):
+    """
+    Get the directory prefix based on pathing settings.
+    
+    Args:
+        context: The current context
+        
+    Returns:
+        str: The interned directory prefix, ending with a separator
+    """
+    props = context.scene.bst_path_props
+    
+    blend_subfolder = _resolve_blend_subfolder(props) if props.use_blend_subfolder else None
+    material_subfolder = _resolve_material_subfolder(props, context) if props.use_material_subfolder else None
+    
+    # Panels redraw constantly with unchanged settings; reuse the last prefix when its inputs match
+    base_path = props.smart_base_path
+    key = (base_path, blend_subfolder, material_subfolder)
+    if _path_prefix_cache["key"] == key:
+        return _path_prefix_cache["value"]
+    
+    # Start with base path, then add the enabled subfolders
+    parts = [base_path]
+    if not base_path.endswith(('\\', '/')):
+        parts.append('/')
+    if blend_subfolder is not None:
+        parts.append(blend_subfolder)
+        parts.append('/')
+    if material_subfolder is not None:
+        parts.append(material_subfolder)
+        parts.append('/')
+    
+    path = sys.intern(''.join(parts))
+    _path_prefix_cache["key"] = key
+    _path_prefix_cache["value"] = path
+    return path
+
 # Update get_combined_path function for path construction
 def get_combined_path(context, datablock_name, extension=""):
     """
@@ -1381,266 +1743,249 @@ def get_combined_path(context, datablock_name, extension=""):
     Returns:
         str: The combined path
     """
-    props = context.scene.bst_path_props
-    
-    # Start with base path
-    path = props.smart_base_path
-    if not path.endswith(('\\', '/')):
-        path += '/'
-        
-    # Add blend subfolder if enabled
-    if props.use_blend_subfolder:
-        subfolder = props.blend_subfolder
-        if not subfolder:
-            # Try to get blend name if not specified
-            blend_path = bpy.data.filepath
-            if blend_path:
-                subfolder = os.path.splitext(os.path.basename(blend_path))[0]
-            else:
-                subfolder = "untitled"
-        
-        path += subfolder + '/'
-        
-    # Add material subfolder if enabled
-    if props.use_material_subfolder:
-        subfolder = props.material_subfolder
-        if not subfolder:
-            # Try to get material name if not specified
-            material_name = None
-            # Try to get from active object
-            obj = getattr(context, 'active_object', None)
-            if obj and hasattr(obj, 'active_material') and obj.active_material:
-                material_name = obj.active_material.name
-            # Fallback: try to get from node editor's node tree
-            elif (context.space_data and context.space_data.type == 'NODE_EDITOR' and
-                  hasattr(context.space_data, 'tree_type') and 
-                  context.space_data.tree_type == 'ShaderNodeTree' and
-                  context.space_data.node_tree):
-                node_tree_name = context.space_data.node_tree.name
-                if node_tree_name in bpy.data.materials:
-                    material_name = bpy.data.materials[node_tree_name].name
-                else:
-                    material_name = node_tree_name
-            
-            if material_name:
-                subfolder = material_name
-            else:
-                subfolder = "material"
-        
-        path += subfolder + '/'
-    
     # Append datablock name and extension
-    return path + datablock_name + extension
+    return get_path_prefix(context) + datablock_name + extension
 
-# Panel for Shader Editor sidebar
-class RBST_PathMan_PT_bulk_path_tools(Panel):
-    bl_label = "Bulk Pathing"
-    bl_idname = "RBST_PathMan_PT_bulk_path_tools"
-    bl_space_type = 'NODE_EDITOR'
-    bl_region_type = 'UI'
-    bl_category = 'Node'
-    bl_context = 'shader'
-    
-    @classmethod
-    def poll(cls, context):
-        return hasattr(context.space_data, 'tree_type') and context.space_data.tree_type == 'ShaderNodeTree'
-    
-    def draw(self, context):
-        layout = self.layout
-        scene = context.scene
-        path_props = scene.bst_path_props        
-        
-        layout.separator()
-        
-        # Progress display section
-        if path_props.is_operation_running:
-            box = layout.box()
-            box.label(text="Operation Progress", icon='TIME')
-            
-            # Progress bar
-            row = box.row()
-            row.prop(path_props, "operation_progress", text="")
-            
-            # Status message
-            if path_props.operation_status:
-                row = box.row()
-                row.label(text=path_props.operation_status, icon='INFO')
-            
-            # Cancel button
-            row = box.row()
-            row.operator("bst.cancel_operation", text="Cancel Operation", icon='X')
-            
-            layout.separator()
-        
-        # Workflow section
+# Shared body for the Shader Editor and 3D Viewport path panels
+def _draw_bulk_path_ui(layout, context):
+    """Draw the bulk pathing UI into the given layout"""
+    scene = context.scene
+    path_props = scene.bst_path_props
+    # Flags read more than once below; string props stay on path_props for prop() widgets
+    use_blend = path_props.use_blend_subfolder
+    use_mat = path_props.use_material_subfolder
+    show_bulk = path_props.show_bulk_operations
+    # Counted on every draw so it can't go stale after undo, deletion or other operators
+    selected_count = _count_selected_images()
+    
+    layout.separator()
+    
+    # Progress display section
+    if path_props.is_operation_running:
         box = layout.box()
-        box.label(text="Workflow", icon_value=0)
-        col = box.column(heading='', align=True)
-        
-        # Autopack toggle (full width)
-        col.prop(bpy.data, "use_autopack", text="Autopack", icon='PACKAGE')
-        
-        # Pack/Unpack split
-        split = col.split(factor=0.5, align=True)
-        split.operator("bst.pack_images", text="Pack", icon='PACKAGE')
-        split.operator("bst.unpack_images", text="Unpack Local", icon='UGLYPACKAGE')
-        
-        # Remove packed/Extensions split
-        split = col.split(factor=0.5, align=True)
-        split.operator("bst.remove_packed_images", text="Remove Pack", icon='TRASH')
-        split.operator("bst.remove_extensions", text="Remove Ext", icon='X')
-        
-        # Make paths relative/absolute split
-        split = col.split(factor=0.5, align=True)
-        split.operator("bst.make_paths_relative", text="Make Relative", icon='FILE_FOLDER')
-        split.operator("bst.make_paths_absolute", text="Make Absolute", icon='FILE_FOLDER')
-
-        # Flat color renaming (full width)
-        col.operator("bst.rename_flat_colors", text="Rename Flat Colors", icon='COLOR')
-        
-        # Save images (full width)
-        col.operator("bst.save_all_images", text="Save All", icon='EXPORT')
+        box.label(text="Operation Progress", icon='TIME')
         
-        # Path Settings UI
-        box.separator()
-        
-        # Base path
-        row = box.row(align=True)
-        row.prop(path_props, "smart_base_path", text="Base Path")
-        
-        # Blend subfolder
-        row = box.row()
-        subrow = row.row()
-        subrow.prop(path_props, "use_blend_subfolder", text="")
-        subrow = row.row()
-        subrow.enabled = path_props.use_blend_subfolder
-        subrow.prop(path_props, "blend_subfolder", text="Blend Subfolder")
-        reuse_blend = subrow.operator("bst.reuse_blend_name", text="", icon='FILE_REFRESH')
-        
-        # Material subfolder
+        # Progress bar
         row = box.row()
-        subrow = row.row()
-        subrow.prop(path_props, "use_material_subfolder", text="")
-        subrow = row.row()
-        subrow.enabled = path_props.use_material_subfolder
-        subrow.prop(path_props, "material_subfolder", text="Material Subfolder")
-        reuse_material = subrow.operator("bst.reuse_material_path", text="", icon='FILE_REFRESH')
-        
-        # Example path
-        example_path = get_combined_path(context, "texture_name", ".png")
-        row = box.row()
-        row.alignment = 'RIGHT'
-        row.label(text=f"Preview: {example_path}")
+        row.prop(path_props, "operation_progress", text="")
         
-        # Remap selected button - placed right under the preview
-        any_selected = any(hasattr(img, "bst_selected") and img.bst_selected for img in bpy.data.images)
-        row = box.row()
-        row.enabled = any_selected
-        row.operator("bst.bulk_remap", text="Remap Selected", icon='FILE_REFRESH')
+        # Status message
+        operation_status = path_props.operation_status
+        if operation_status:
+            row = box.row()
+            row.label(text=operation_status, icon='INFO')
         
-        # Rename by Material and AutoMat buttons - placed right after remap selected
+        # Cancel button
         row = box.row()
-        row.enabled = any_selected
-        row.operator("bst.rename_images_by_mat", text="Rename by Material", icon='OUTLINER_DATA_FONT')
+        row.operator("bst.cancel_operation", text="Cancel Operation", icon='X')
         
-        # Get addon preferences
-        addon_name = __package__.split('.')[0]
-        addon_entry = context.preferences.addons.get(addon_name)
-        prefs = addon_entry.preferences if addon_entry else None
+        layout.separator()
+    
+    # Workflow section
+    box = layout.box()
+    box.label(text="Workflow", icon_value=0)
+    col = box.column(heading='', align=True)
+    
+    # Autopack toggle (full width)
+    col.prop(bpy.data, "use_autopack", text="Autopack", icon='PACKAGE')
+    
+    # Pack/Unpack split
+    split = col.split(factor=0.5, align=True)
+    split.operator("bst.pack_images", text="Pack", icon='PACKAGE')
+    split.operator("bst.unpack_images", text="Unpack Local", icon='UGLYPACKAGE')
+    
+    # Remove packed/Extensions split
+    split = col.split(factor=0.5, align=True)
+    split.operator("bst.remove_packed_images", text="Remove Pack", icon='TRASH')
+    split.operator("bst.remove_extensions", text="Remove Ext", icon='X')
+    
+    # Make paths relative/absolute split
+    split = col.split(factor=0.5, align=True)
+    split.operator("bst.make_paths_relative", text="Make Relative", icon='FILE_FOLDER')
+    split.operator("bst.make_paths_absolute", text="Make Absolute", icon='FILE_FOLDER')
+
+    # Flat color renaming (full width)
+    row = col.row(align=True)
+    row.operator("bst.rename_flat_colors", text="Rename Flat Colors", icon='COLOR')
+    row.prop(path_props, "flat_color_skip_unloaded", text="", icon='IMAGE_DATA')
+    col.prop(path_props, "flat_color_max_megapixels", text="Flat Color Max MP")
+    
+    # Save images (full width)
+    col.operator("bst.save_all_images", text="Save All", icon='EXPORT')
+    
+    # Path Settings UI
+    box.separator()
+    
+    # Base path
+    row = box.row(align=True)
+    row.prop(path_props, "smart_base_path", text="Base Path")
+    
+    # Blend subfolder
+    row = box.row()
+    subrow = row.row()
+    subrow.prop(path_props, "use_blend_subfolder", text="")
+    subrow = row.row()
+    subrow.enabled = use_blend
+    subrow.prop(path_props, "blend_subfolder", text="Blend Subfolder")
+    reuse_blend = subrow.operator("bst.reuse_blend_name", text="", icon='FILE_REFRESH')
+    
+    # Material subfolder
+    row = box.row()
+    subrow = row.row()
+    subrow.prop(path_props, "use_material_subfolder", text="")
+    subrow = row.row()
+    subrow.enabled = use_mat
+    subrow.prop(path_props, "material_subfolder", text="Material Subfolder")
+    reuse_material = subrow.operator("bst.reuse_material_path", text="", icon='FILE_REFRESH')
+    
+    # Example path
+    example_path = get_combined_path(context, "texture_name", ".png")
+    row = box.row()
+    row.alignment = 'RIGHT'
+    row.label(text=f"Preview: {example_path}")
+    
+    # Remap selected button - placed right under the preview
+    any_selected = selected_count > 0
+    row = box.row()
+    row.enabled = any_selected
+    row.operator("bst.bulk_remap", text="Remap Selected", icon='FILE_REFRESH')
+    
+    # Rename by Material and AutoMat buttons - placed right after remap selected
+    row = box.row()
+    row.enabled = any_selected
+    row.operator("bst.rename_images_by_mat", text="Rename by Material", icon='OUTLINER_DATA_FONT')
+    
+    # Get addon preferences
+    addon_name = __package__.split('.')[0]
+    addon_entry = context.preferences.addons.get(addon_name)
+    prefs = addon_entry.preferences if addon_entry else None
+    
+    row = box.row(align=True)
+    row.enabled = any_selected
+    
+    # Split row for button and checkbox
+    split = row.split(factor=0.8)
+    
+    # Left side: button
+    split.operator("bst.automatextractor", text="AutoMat Extractor", icon='PACKAGE')
+    
+    # Right side: checkbox
+    col = split.column()
+    if prefs:
+        col.prop(prefs, "automat_common_outside_blend", text="", icon='FOLDER_REDIRECT')
+    
+    # Bulk operations section
+    box = layout.box()
+    box.label(text="Bulk Operations", icon='MODIFIER')
+    row = box.row()
+    row.prop(path_props, "show_bulk_operations", 
+             text="Show Bulk Operations", 
+             icon="TRIA_DOWN" if show_bulk else "TRIA_RIGHT",
+             icon_only=True, emboss=False)
+    row.label(text="Image Selection")
+    
+    # Show bulk operations UI only when expanded
+    if show_bulk:
+        # Select all row
+        row = box.row()
+        row.label(text="Select:")
+        select_all = row.operator("bst.toggle_select_all", text="All")
+        select_all.select_state = True
+        deselect_all = row.operator("bst.toggle_select_all", text="None")
+        deselect_all.select_state = False
         
+        # Node editor selection buttons
         row = box.row(align=True)
-        row.enabled = any_selected
-        
-        # Split row for button and checkbox
-        split = row.split(factor=0.8)
-        
-        # Left side: button
-        split.operator("bst.automatextractor", text="AutoMat Extractor", icon='PACKAGE')
+        row.operator("bst.select_material_images", text="Material Images")
+        row.operator("bst.select_active_images", text="Active Images")
+        row.operator("bst.select_absolute_images", text="Absolute Images", icon='FOLDER_REDIRECT')
         
-        # Right side: checkbox
-        col = split.column()
-        if prefs:
-            col.prop(prefs, "automat_common_outside_blend", text="", icon='FOLDER_REDIRECT')
+        # Sorting option
+        row = box.row()
+        row.prop(path_props, "sort_by_selected", text="Sort by Selected")
         
-        # Bulk operations section
-        box = layout.box()
-        box.label(text="Bulk Operations", icon='MODIFIER')
+        # Search filter
         row = box.row()
-        row.prop(path_props, "show_bulk_operations", 
-                 text="Show Bulk Operations", 
-                 icon="TRIA_DOWN" if path_props.show_bulk_operations else "TRIA_RIGHT",
-                 icon_only=True, emboss=False)
-        row.label(text="Image Selection")
-        
-        # Show bulk operations UI only when expanded
-        if path_props.show_bulk_operations:
-            # Select all row
-            row = box.row()
-            row.label(text="Select:")
-            select_all = row.operator("bst.toggle_select_all", text="All")
-            select_all.select_state = True
-            deselect_all = row.operator("bst.toggle_select_all", text="None")
-            deselect_all.select_state = False
+        row.label(text="", icon='VIEWZOOM')
+        row.prop(path_props, "search_filter", text="")
+
+        box.separator()
+        
+        # Image selection list with thumbnails
+        _prune_preview_icon_ids()
+        if len(bpy.data.images) > 0:
+            # Sort images if enabled (nothing to reorder when none or all are selected)
+            if path_props.sort_by_selected and 0 < selected_count < len(bpy.data.images):
+                # Create a sorted list with selected images first
+                sorted_images = _images_selected_first()
+            else:
+                # Use original order
+                sorted_images = bpy.data.images
             
-            # Node editor selection buttons
-            row = box.row(align=True)
-            row.operator("bst.select_material_images", text="Material Images")
-            row.operator("bst.select_active_images", text="Active Images")
-            row.operator("bst.select_absolute_images", text="Absolute Images", icon='FOLDER_REDIRECT')
+            # Filter by search string if provided
+            search_filter = path_props.search_filter
+            if search_filter:
+                search_lower = search_filter.lower()
+                sorted_images = [img for img in sorted_images if search_lower in img.name.lower()]
             
-            # Sorting option
-            row = box.row()
-            row.prop(path_props, "sort_by_selected", text="Sort by Selected")
+            # Only draw the current page of the list
+            page_size = path_props.page_size
+            total = len(sorted_images)
+            page_count = (total - 1) // page_size + 1 if total else 1
+            page = min(path_props.page_index, page_count - 1)
+            start = page * page_size
+            end = start + page_size
             
-            # Search filter
-            row = box.row()
-            row.label(text="", icon='VIEWZOOM')
-            row.prop(path_props, "search_filter", text="")
-
-            box.separator()
-            
-            # Image selection list with thumbnails
-            if len(bpy.data.images) > 0:
-                # Sort images if enabled
-                if path_props.sort_by_selected:
-                    # Create a sorted list with selected images first
-                    sorted_images = sorted(bpy.data.images, 
-                                           key=lambda img: not getattr(img, "bst_selected", False))
-                else:
-                    # Use original order
-                    sorted_images = bpy.data.images
+            col = box.column(align=True)
+            for img in islice(sorted_images, start, end):
+                name = img.name
+                row = col.row(align=True)
                 
-                # Filter by search string if provided
-                search_filter = path_props.search_filter
-                if search_filter:
-                    search_lower = search_filter.lower()
-                    sorted_images = [img for img in sorted_images if search_lower in img.name.lower()]
+                # Checkbox for selection - use operator for shift+click support
+                op = row.operator("bst.toggle_image_selection", text="", 
+                                icon='CHECKBOX_HLT' if img.bst_selected else 'CHECKBOX_DEHLT',
+                                emboss=False)
+                op.image_name = name
                 
-                for img in sorted_images:
-                    # Add bst_selected attribute if it doesn't exist
-                    if not hasattr(img, "bst_selected"):
-                        img.bst_selected = False
-                    
-                    row = box.row(align=True)
-                    
-                    # Checkbox for selection - use operator for shift+click support
-                    op = row.operator("bst.toggle_image_selection", text="", 
-                                    icon='CHECKBOX_HLT' if img.bst_selected else 'CHECKBOX_DEHLT',
-                                    emboss=False)
-                    op.image_name = img.name
-                    
-                    # Image thumbnail
-                    if hasattr(img, 'preview'):
-                        # Use the actual image thumbnail
-                        row.template_icon(icon_value=img.preview_ensure().icon_id, scale=1.0)
-                    else:
-                        row.label(text="", icon='IMAGE_DATA')
-                    
-                    # Image name with rename operator
-                    rename_op = row.operator("bst.rename_datablock", text=img.name, emboss=False)
-                    rename_op.old_name = img.name
-            else:
-                box.label(text="No images in blend file")
+                # Image thumbnail
+                row.template_icon(icon_value=_get_preview_icon_id(img), scale=1.0)
+                
+                # Image name with rename operator
+                rename_op = row.operator("bst.rename_datablock", text=name, emboss=False)
+                rename_op.old_name = name
+            
+            if total > page_size:
+                row = box.row(align=True)
+                sub = row.row(align=True)
+                sub.enabled = page > 0
+                op = sub.operator("bst.image_list_page", text="", icon='TRIA_LEFT')
+                op.delta = -1
+                op.page_count = page_count
+                row.label(text=f"Page {page + 1} of {page_count}")
+                sub = row.row(align=True)
+                sub.enabled = page < page_count - 1
+                op = sub.operator("bst.image_list_page", text="", icon='TRIA_RIGHT')
+                op.delta = 1
+                op.page_count = page_count
+                row.prop(path_props, "page_size", text="Per Page")
+        else:
+            box.label(text="No images in blend file")
+
+# Panel for Shader Editor sidebar
+class RBST_PathMan_PT_bulk_path_tools(Panel):
+    bl_label = "Bulk Pathing"
+    bl_idname = "RBST_PathMan_PT_bulk_path_tools"
+    bl_space_type = 'NODE_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = 'Node'
+    bl_context = 'shader'
+    
+    @classmethod
+    def poll(cls, context):
+        return hasattr(context.space_data, 'tree_type') and context.space_data.tree_type == 'ShaderNodeTree'
+    
+    def draw(self, context):
+        _draw_bulk_path_ui(self.layout, context)
 
 # Sub-panel for existing Bulk Scene Tools
 class RBST_PathMan_PT_bulk_path_subpanel(Panel):
@@ -1655,7 +2000,7 @@ class RBST_PathMan_PT_bulk_path_subpanel(Panel):
     
     def draw(self, context):
         # Use the same draw function as the NODE_EDITOR panel
-        RBST_PathMan_PT_bulk_path_tools.draw(self, context)
+        _draw_bulk_path_ui(self.layout, context)
 
 # Registration function for this module
 classes = (
@@ -1663,6 +2008,7 @@ classes = (
     RBST_PathMan_PG_PathProperties,
     RBST_PathMan_OT_remap_path,
     RBST_PathMan_OT_toggle_select_all,
+    RBST_PathMan_OT_image_list_page,
     RBST_PathMan_OT_bulk_remap,
     RBST_PathMan_OT_toggle_path_edit,
     RBST_PathMan_OT_select_material_images,
@@ -1699,9 +2045,13 @@ def register():
     )
     
     # For debugging only
-    print("Bulk Path Management registered successfully")
+    _log.debug("Bulk Path Management registered successfully")
 
 def unregister():
+    global _preview_icon_image_count
+    _preview_icon_ids.clear()
+    _preview_icon_image_count = 0
+    
     # Remove custom property
     if hasattr(bpy.types.Image, "bst_selected"):
         del bpy.types.Image.bst_selected
@@ -1,13 +1,4 @@
 import bpy
-from ..ops.NoSubdiv import NoSubdiv
-from ..ops.remove_custom_split_normals import RemoveCustomSplitNormals
-from ..ops.create_ortho_camera import CreateOrthoCamera
-from ..ops.spawn_scene_structure import SpawnSceneStructure
-from ..ops.delete_single_keyframe_actions import DeleteSingleKeyframeActions
-from ..ops.remove_unused_material_slots import RemoveUnusedMaterialSlots
-from ..ops.convert_relations_to_constraint import ConvertRelationsToConstraint
-from ..ops.remove_action_fake_users import RemoveActionFakeUsers
-from ..ops.white_world import WhiteWorld
 from ..utils import compat
 
 class RBST_SceneGen_PT_BulkSceneGeneral(bpy.types.Panel):
@@ -20,6 +11,26 @@ class RBST_SceneGen_PT_BulkSceneGeneral(bpy.types.Panel):
     bl_parent_id = "VIEW3D_PT_bulk_scene_tools"
     bl_order = 0  # This will make it appear at the very top of the main panel
     
+    # (operator, label, icon keyword) for the one-button rows
+    _MESH_BUTTONS = (
+        ("bst.create_ortho_camera", "Create Ortho Camera", {"icon": 'OUTLINER_DATA_CAMERA'}),
+        ("bst.free_gpu", "Free GPU", {"icon": 'MEMORY'}),
+    )
+    _MATERIAL_BUTTONS = (
+        ("bst.remove_unused_material_slots", "Remove Unused Material Slots", {"icon": 'MATERIAL'}),
+    )
+    _ANIMATION_BUTTONS = (
+        ("bst.remove_action_fake_users", "Remove Action FU", {"icon": 'FAKE_USER_OFF'}),
+        ("bst.delete_single_keyframe_actions", "Delete Single Keyframe Actions", {"icon": 'ANIM_DATA'}),
+        ("bst.convert_relations_to_constraint", "Convert Relations to Constraint", {"icon_value": 405}),
+    )
+    
+    @staticmethod
+    def _draw_buttons(box, buttons):
+        col = box.column(align=True)
+        for idname, text, icon_kwargs in buttons:
+            col.operator(idname, text=text, **icon_kwargs)
+    
     def draw(self, context):
         layout = self.layout
         
@@ -29,56 +40,64 @@ class RBST_SceneGen_PT_BulkSceneGeneral(bpy.types.Panel):
         row = box.row()
         row.scale_y = 1.2
         row.operator("bst.spawn_scene_structure", text="Spawn Scene Structure", icon='OUTLINER_COLLECTION')
-        row = box.row(align=True)
-        row.operator("bst.white_world", text="White World", icon='WORLD')
+        box.operator("bst.white_world", text="White World", icon='WORLD')
         
         # Mesh section
         box = layout.box()
         box.label(text="Mesh")
         # Add checkbox for only_selected property
+        wm = context.window_manager
+        only_selected = wm.bst_no_subdiv_only_selected
         row = box.row()
-        row.prop(context.window_manager, "bst_no_subdiv_only_selected", text="Selected Only")
+        row.prop(wm, "bst_no_subdiv_only_selected", text="Selected Only")
         row = box.row(align=True)
-        row.operator("bst.no_subdiv", text="No Subdiv", icon='MOD_SUBSURF').only_selected = context.window_manager.bst_no_subdiv_only_selected
-        row.operator("bst.remove_custom_split_normals", text="Remove Custom Split Normals", icon='X').only_selected = context.window_manager.bst_no_subdiv_only_selected
+        row.operator("bst.no_subdiv", text="No Subdiv", icon='MOD_SUBSURF').only_selected = only_selected
+        row.operator("bst.remove_custom_split_normals", text="Remove Custom Split Normals", icon='X').only_selected = only_selected
 
-        row = box.row(align=True)
-        row.operator("bst.create_ortho_camera", text="Create Ortho Camera", icon='OUTLINER_DATA_CAMERA')
-        row = box.row(align=True)
-        row.operator("bst.free_gpu", text="Free GPU", icon='MEMORY')
+        self._draw_buttons(box, self._MESH_BUTTONS)
 
         # Materials section
         box = layout.box()
         box.label(text="Materials")
-        row = box.row(align=True)
-        row.operator("bst.remove_unused_material_slots", text="Remove Unused Material Slots", icon='MATERIAL')
+        self._draw_buttons(box, self._MATERIAL_BUTTONS)
 
         # Animation Data section
         box = layout.box()
         box.label(text="Animation Data")
-        row = box.row(align=True)
-        row.operator("bst.remove_action_fake_users", text="Remove Action FU", icon='FAKE_USER_OFF')
-        row = box.row(align=True)
-        row.operator("bst.delete_single_keyframe_actions", text="Delete Single Keyframe Actions", icon='ANIM_DATA')
-        row = box.row(align=True)
-        row.operator("bst.convert_relations_to_constraint", text="Convert Relations to Constraint", icon_value=405)
+        self._draw_buttons(box, self._ANIMATION_BUTTONS)
+
+def _load_ops():
+    """Import the operator classes this panel exposes (deferred until register)"""
+    from ..ops.NoSubdiv import NoSubdiv
+    from ..ops.remove_custom_split_normals import RemoveCustomSplitNormals
+    from ..ops.create_ortho_camera import CreateOrthoCamera
+    from ..ops.spawn_scene_structure import SpawnSceneStructure
+    from ..ops.delete_single_keyframe_actions import DeleteSingleKeyframeActions
+    from ..ops.remove_unused_material_slots import RemoveUnusedMaterialSlots
+    from ..ops.convert_relations_to_constraint import ConvertRelationsToConstraint
+    from ..ops.remove_action_fake_users import RemoveActionFakeUsers
+    from ..ops.white_world import WhiteWorld
+    return (
+        NoSubdiv,
+        RemoveCustomSplitNormals,
+        CreateOrthoCamera,
+        SpawnSceneStructure,
+        WhiteWorld,
+        DeleteSingleKeyframeActions,
+        RemoveUnusedMaterialSlots,
+        ConvertRelationsToConstraint,
+        RemoveActionFakeUsers,
+    )
 
-# List of all classes in this module
+# List of all classes in this module (operators are added at register time)
 classes = (
     RBST_SceneGen_PT_BulkSceneGeneral,
-    NoSubdiv,  # Add NoSubdiv operator class
-    RemoveCustomSplitNormals,
-    CreateOrthoCamera,
-    SpawnSceneStructure,
-    WhiteWorld,
-    DeleteSingleKeyframeActions,
-    RemoveUnusedMaterialSlots,
-    ConvertRelationsToConstraint,
-    RemoveActionFakeUsers,
 )
 
 # Registration
 def register():
+    global classes
+    classes = (RBST_SceneGen_PT_BulkSceneGeneral,) + _load_ops()
     for cls in classes:
         compat.safe_register_class(cls)
     # Register the window manager property for the checkbox
@@ -92,5 +111,7 @@ def unregister():
     for cls in reversed(classes):
         compat.safe_unregister_class(cls)
     # Unregister the window manager property
-    if hasattr(bpy.types.WindowManager, "bst_no_subdiv_only_selected"):
-        del bpy.types.WindowManager.bst_no_subdiv_only_selected
\ No newline at end of file
+    try:
+        del bpy.types.WindowManager.bst_no_subdiv_only_selected
+    except AttributeError:
+        pass
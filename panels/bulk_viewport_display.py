@@ -2,12 +2,14 @@ import bpy # type: ignore
 import numpy as np
 from time import time
 import os
+import logging
 from enum import Enum
-import colorsys  # Add colorsys for RGB to HSV conversion
 from ..ops.select_diffuse_nodes import select_diffuse_nodes  # Import the specific function
 from ..utils import compat
 from ..utils import version
 
+_log = logging.getLogger(__name__)
+
 # Material processing status enum
 class RBST_ViewDisp_MaterialStatus(Enum):
     PENDING = 0
@@ -26,6 +28,21 @@ is_processing = False
 material_queue = []
 current_index = 0
 
+# Scratch buffer for material thumbnail pixels, reused across get_color_from_preview calls
+_preview_buffer = None
+
+# Upper bound on pixels averaged per image; larger images are sampled with a stride
+_AVERAGE_COLOR_MAX_SAMPLES = 65536
+
+# Average colors of images already sampled this run, so shared textures are only read once
+# {(image_name, width, height, pixel_count): [r, g, b]}
+_image_color_cache = {}
+
+# First mesh object and slot using each material, for Select Material
+# {material session_uid: ((object name, library filepath), slot_index)}; None until built,
+# and reset by the depsgraph handler when objects, meshes or materials change
+_material_users = None
+
 # Scene properties for viewport display settings
 def RBST_ViewDisp_register_properties():
     bpy.types.Scene.viewport_colors_selected_only = bpy.props.BoolProperty(  # type: ignore
@@ -42,12 +59,6 @@ def RBST_ViewDisp_register_properties():
         max=50
     )
     
-    bpy.types.Scene.viewport_colors_use_vectorized = bpy.props.BoolProperty(  # type: ignore
-        name="Use Vectorized Processing",
-        description="Use vectorized operations for image processing (faster but uses more memory)",
-        default=True
-    )
-    
     bpy.types.Scene.viewport_colors_darken_amount = bpy.props.FloatProperty(  # type: ignore
         name="Color Adjustment",
         description="Adjust viewport colors by ±10% (+1 = +10% lighter, 0 = no change, -1 = -10% darker)",
@@ -97,7 +108,6 @@ def RBST_ViewDisp_register_properties():
 def unregister_viewport_properties():
     del bpy.types.Scene.viewport_colors_use_preview
     del bpy.types.Scene.viewport_colors_batch_size
-    del bpy.types.Scene.viewport_colors_use_vectorized
     del bpy.types.Scene.viewport_colors_darken_amount
     del bpy.types.Scene.viewport_colors_value_amount
     del bpy.types.Scene.viewport_colors_progress
@@ -111,32 +121,42 @@ class RBST_ViewDisp_OT_SetViewportColors(bpy.types.Operator):
     bl_label = "Set Viewport Colors"
     bl_options = {'REGISTER', 'UNDO'}
     
+    # Seconds of color extraction per timer tick before yielding back to the UI
+    batch_time_budget = 0.1
+    
     def execute(self, context):
         global material_results, current_material, processed_count, total_materials, start_time, is_processing, material_queue, current_index
         
         # Reset global variables
         material_results = {}
+        _image_color_cache.clear()
         current_material = ""
         processed_count = 0
         is_processing = True
         start_time = time()
         current_index = 0
+        # Colors to write once extraction finishes, as (material session_uid, color)
+        self.pending_color_changes = []
         
         # Get materials based on selection mode
         if context.scene.viewport_colors_selected_only:
             # Get materials from selected objects only
             materials = []
+            seen = set()
             for obj in context.selected_objects:
                 if obj.type == 'MESH' and obj.data.materials:
                     for mat in obj.data.materials:
-                        if mat and not mat.is_grease_pencil and mat not in materials:
+                        if mat and mat.session_uid not in seen and not mat.is_grease_pencil:
+                            seen.add(mat.session_uid)
                             materials.append(mat)
         else:
             # Get all materials in the scene
             materials = [mat for mat in bpy.data.materials if not mat.is_grease_pencil]
         
         total_materials = len(materials)
-        material_queue = materials.copy()
+        # Queue session uids rather than references or names: they are resolved again when
+        # processed, and unlike names they can't mix up a linked and a local material
+        material_queue = [mat.session_uid for mat in materials]
         
         if total_materials == 0:
             self.report({'WARNING'}, "No materials found to process")
@@ -159,88 +179,103 @@ class RBST_ViewDisp_OT_SetViewportColors(bpy.types.Operator):
             self.report_info()
             return None
         
-        # Get the batch size from scene properties
-        batch_size = bpy.context.scene.viewport_colors_batch_size
-        use_vectorized = bpy.context.scene.viewport_colors_use_vectorized
+        # Get the batch size and color settings from scene properties once per batch
+        scene = bpy.context.scene
+        batch_size = scene.viewport_colors_batch_size
+        # Adjustment amounts (-1 to +1) scaled to ±10%
+        color_adjustment = scene.viewport_colors_darken_amount * 0.1
+        saturation_adjustment = scene.viewport_colors_value_amount * 0.1
         
         # Process a batch of materials
         batch_end = min(current_index + batch_size, len(material_queue))
         batch = material_queue[current_index:batch_end]
         
-        for material in batch:
-            # Skip if material is invalid or has been deleted
-            if material is None or material.name not in bpy.data.materials:
+        # bpy is not thread-safe, so extraction stays on the main thread; instead each tick
+        # works through up to batch_size materials until its time budget is spent
+        deadline = time() + self.batch_time_budget
+        materials_by_uid = {mat.session_uid: mat for mat in bpy.data.materials}
+        sampled = []
+        for i, material_uid in enumerate(batch):
+            if i and time() >= deadline:
+                break
+            
+            # Skip if material has been deleted since the queue was built
+            material = materials_by_uid.get(material_uid)
+            if material is None:
                 processed_count += 1
+                current_index += 1
                 continue
                 
             current_material = material.name
             
-            # Process the material
-            color, status = process_material(material, use_vectorized)
-            
-            # Apply the color to the material
-            if color:
-                # Store the color change to apply later in main thread
-                material_results[material.name] = (color, status)
-                # Mark this material for color application
-                if not hasattr(self, 'pending_color_changes'):
-                    self.pending_color_changes = []
-                self.pending_color_changes.append((material, color))
-            else:
-                # Store the result without color change
-                material_results[material.name] = (None, status)
+            # Process the material (color correction happens once for the whole batch below)
+            color, status = process_material(material)
+            sampled.append((material_uid, current_material, color, status))
             
             # Update processed count
             processed_count += 1
+            current_index += 1
+        
+        # Correct all extracted thumbnail colors for viewport display in one pass
+        extracted = [color for _, _, color, _ in sampled if color is not _FALLBACK_COLOR]
+        corrected = iter(correct_viewport_color(extracted, color_adjustment, saturation_adjustment).tolist()) if extracted else iter(())
+        
+        for material_uid, material_name, color, status in sampled:
+            if color is not _FALLBACK_COLOR:
+                color = tuple(next(corrected))
             
-            # Update progress
-            if total_materials > 0:
-                bpy.context.scene.viewport_colors_progress = (processed_count / total_materials) * 100
+            # Store the color change to apply later in main thread
+            material_results[material_name] = (color, status)
+            # Mark this material for color application
+            self.pending_color_changes.append((material_uid, color))
         
-        # Update the current index
-        current_index = batch_end
+        # Update progress
+        if total_materials > 0:
+            scene.viewport_colors_progress = (processed_count / total_materials) * 100
         
-        # Force a redraw of the UI
+        # Force a redraw of the 3D views, where the panel and its progress bar live
         for area in bpy.context.screen.areas:
-            area.tag_redraw()
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
         
         # Check if we're done
         if current_index >= len(material_queue):
             is_processing = False
             # Apply pending color changes in main thread
-            if hasattr(self, 'pending_color_changes') and self.pending_color_changes:
+            if self.pending_color_changes:
                 bpy.app.timers.register(self._apply_color_changes)
             self.report_info()
             return None
         
         # Continue processing
-        return 0.1  # Check again in 0.1 seconds
+        return 0.01  # The time budget already bounds each tick, so only yield briefly
     
     def _apply_color_changes(self):
         """Apply pending color changes in the main thread"""
-        if not hasattr(self, 'pending_color_changes') or not self.pending_color_changes:
+        if not self.pending_color_changes:
             return None
         
-        # Apply a batch of color changes
-        batch_size = 10  # Process 10 materials at a time
-        batch = self.pending_color_changes[:batch_size]
+        # Resolve every pending material in one pass over the collection, by session_uid
+        materials_by_uid = {mat.session_uid: mat for mat in bpy.data.materials}
         
-        for material, color in batch:
+        # Only the processed materials are written, so materials that weren't part of
+        # the run (including linked and override ones) are never touched
+        changed = 0
+        for material_uid, color in self.pending_color_changes:
+            material = materials_by_uid.get(material_uid)
+            # Skip materials removed since they were processed
+            if material is None:
+                continue
             try:
-                if material and material.name in bpy.data.materials:
-                    material.diffuse_color = (*color, 1.0)
+                material.diffuse_color = (*color, 1.0)
+                changed += 1
             except Exception as e:
-                print(f"Could not set diffuse_color for {material.name if material else 'Unknown'}: {e}")
+                print(f"Could not set diffuse_color for {material.name}: {e}")
         
-        # Remove processed items
-        self.pending_color_changes = self.pending_color_changes[batch_size:]
-        
-        # Continue if there are more to process
-        if self.pending_color_changes:
-            return 0.01  # Process next batch in 0.01 seconds
+        self.pending_color_changes.clear()
         
         # All done
-        print(f"Applied viewport colors to {len(batch)} materials")
+        print(f"Applied viewport colors to {changed} materials")
         return None
     
     def report_info(self):
@@ -302,6 +337,11 @@ class RBST_ViewDisp_OT_RefreshMaterialPreviews(bpy.types.Operator):
             return {'CANCELLED'}
         
         try:
+            # Give the preview object a single material slot up front; each material is
+            # then just assigned into it (the slot is cleared during cleanup)
+            if not temp_obj.data.materials:
+                temp_obj.data.materials.append(None)
+            
             for material in bpy.data.materials:
                 if not material or material.is_grease_pencil:
                     continue
@@ -380,14 +420,11 @@ class RBST_ViewDisp_OT_RefreshMaterialPreviews(bpy.types.Operator):
     def _force_preview(self, material, temp_obj, context):
         """Force preview generation for a material with proper error handling."""
         try:
-            # Assign material to temp object
-            if temp_obj.data.materials:
-                temp_obj.data.materials[0] = material
-            else:
-                temp_obj.data.materials.append(material)
+            # Assign material to the temp object's preallocated slot
+            temp_obj.data.materials[0] = material
             
-            # Set preview render type if available
-            if hasattr(material, 'preview_render_type'):
+            # Set preview render type if available (re-assigning invalidates the preview)
+            if hasattr(material, 'preview_render_type') and material.preview_render_type != 'SPHERE':
                 material.preview_render_type = 'SPHERE'
             
             # Ensure preview exists - this may fail in some Blender versions
@@ -412,115 +449,125 @@ class RBST_ViewDisp_OT_RefreshMaterialPreviews(bpy.types.Operator):
                             _ = material.preview
                         except Exception:
                             pass
-            
-            # Clear material assignment to avoid keeping references
-            if temp_obj.data.materials:
-                temp_obj.data.materials.clear()
         except Exception as exc:
             # Re-raise to be caught by caller
             raise exc
 
 
-def correct_viewport_color(color):
-    """Adjust viewport colors by color intensity and saturation"""
-    r, g, b = color
-    
-    # Get the color adjustment amount (-1 to +1) and scale it to ±10%
-    color_adjustment = bpy.context.scene.viewport_colors_darken_amount * 0.1
-    
-    # Get the saturation adjustment amount (-1 to +1) and scale it to ±10%
-    saturation_adjustment = bpy.context.scene.viewport_colors_value_amount * 0.1
-    
-    # First apply the color adjustment (RGB)
-    r = r + color_adjustment
-    g = g + color_adjustment
-    b = b + color_adjustment
-    
-    # Clamp RGB values after color adjustment
-    r = max(0.0, min(1.0, r))
-    g = max(0.0, min(1.0, g))
-    b = max(0.0, min(1.0, b))
-    
-    # Then apply the saturation adjustment using HSV
-    if saturation_adjustment != 0:
-        # Convert to HSV
-        h, s, v = colorsys.rgb_to_hsv(r, g, b)
-        
-        # Adjust saturation while preserving hue and value
-        s = s + saturation_adjustment
-        s = max(0.0, min(1.0, s))
-        
-        # Convert back to RGB
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
+# Color used when no thumbnail color can be extracted (left uncorrected)
+_FALLBACK_COLOR = (1, 1, 1)
+
+def _rgb_to_hsv(rgb):
+    """Vectorized colorsys.rgb_to_hsv over an (N, 3) array, returns (h, s, v) arrays"""
+    r, g, b = rgb.T
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    delta = maxc - minc
+    safe_delta = np.where(delta > 0, delta, 1.0)
     
-    return (r, g, b)
+    # Hue candidates for each possible largest channel, picked without branching;
+    # argmax takes the first maximum, so red wins ties, then green, as in colorsys
+    candidates = np.stack((
+        (g - b) / safe_delta,
+        2.0 + (b - r) / safe_delta,
+        4.0 + (r - g) / safe_delta,
+    ), axis=1)
+    h = np.take_along_axis(candidates, rgb.argmax(axis=1)[:, None], axis=1)[:, 0]
+    h = np.where(delta > 0, (h / 6.0) % 1.0, 0.0)
+    s = np.where(maxc > 0, delta / np.where(maxc > 0, maxc, 1.0), 0.0)
+    return h, s, maxc
 
-def process_material(material, use_vectorized=True):
-    """Process a material to determine its viewport color"""
-    if not material:
-        print(f"Material is None, using fallback color")
-        return (1, 1, 1), RBST_ViewDisp_MaterialStatus.PREVIEW_BASED
+def _hsv_to_rgb(h, s, v):
+    """Vectorized colorsys.hsv_to_rgb, returns an (N, 3) array"""
+    k = (np.array([5.0, 3.0, 1.0]) + h[:, None] * 6.0) % 6.0
+    v = v[:, None]
+    return v - v * s[:, None] * np.clip(np.minimum(k, 4.0 - k), 0.0, 1.0)
+
+def correct_viewport_color(colors, color_adjustment, saturation_adjustment):
+    """Adjust viewport colors by color intensity and saturation
+    
+    Works on a whole batch at once: takes an (N, 3) sequence of RGB colors and
+    returns the adjusted (N, 3) array. Both adjustments are already scaled to ±0.1.
+    """
+    rgb = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
     
-    if material.is_grease_pencil:
-        print(f"Material {material.name}: is a grease pencil material, using fallback color")
-        return (1, 1, 1), RBST_ViewDisp_MaterialStatus.PREVIEW_BASED
+    # First apply the color adjustment (RGB), clamping afterwards
+    if color_adjustment != 0:
+        rgb = rgb + color_adjustment
+    rgb = np.clip(rgb, 0.0, 1.0)
+    
+    # Without a saturation adjustment there is no HSV round-trip to do
+    if saturation_adjustment == 0:
+        return rgb
+    
+    h, s, v = _rgb_to_hsv(rgb)
+    
+    # Adjust saturation while preserving hue and value
+    s = np.clip(s + saturation_adjustment, 0.0, 1.0)
+    
+    return _hsv_to_rgb(h, s, v)
+
+def process_material(material):
+    """Process a material to determine its viewport color
+    
+    Returns the raw thumbnail color; the caller applies correct_viewport_color to the
+    whole batch. When no color can be extracted _FALLBACK_COLOR is returned as-is.
+    Grease pencil materials are expected to be filtered out by the caller.
+    """
+    if not material:
+        _log.debug("Material is None, using fallback color")
+        return _FALLBACK_COLOR, RBST_ViewDisp_MaterialStatus.PREVIEW_BASED
     
     try:
         # Get color from material thumbnail
-        print(f"Material {material.name}: Attempting to extract color from thumbnail")
+        _log.debug("Material %s: Attempting to extract color from thumbnail", material.name)
         
         # Get color from the material thumbnail
-        color = get_color_from_preview(material, use_vectorized)
+        color = get_color_from_preview(material)
         
         if color:
-            print(f"Material {material.name}: Thumbnail color = {color}")
-            
-            # Correct color for viewport display
-            corrected_color = correct_viewport_color(color)
-            print(f"Material {material.name}: Corrected thumbnail color = {corrected_color}")
-            
-            return corrected_color, RBST_ViewDisp_MaterialStatus.PREVIEW_BASED
+            _log.debug("Material %s: Thumbnail color = %s", material.name, color)
+            return color, RBST_ViewDisp_MaterialStatus.PREVIEW_BASED
         else:
-            print(f"Material {material.name}: Could not extract color from thumbnail, using fallback color")
-            return (1, 1, 1), RBST_ViewDisp_MaterialStatus.PREVIEW_BASED
+            _log.debug("Material %s: Could not extract color from thumbnail, using fallback color", material.name)
+            return _FALLBACK_COLOR, RBST_ViewDisp_MaterialStatus.PREVIEW_BASED
         
     except Exception as e:
         print(f"Error processing material {material.name}: {e}")
-        return (1, 1, 1), RBST_ViewDisp_MaterialStatus.FAILED
+        return _FALLBACK_COLOR, RBST_ViewDisp_MaterialStatus.FAILED
 
-def get_average_color(image, use_vectorized=True):
+def get_average_color(image):
     """Calculate the average color of an image"""
     if not image or not image.has_data:
         return None
     
-    # Get image pixels
-    pixels = list(image.pixels)
+    # Size the buffer from the image dimensions rather than the pixel array length
+    width, height = image.size
+    channels = image.channels
+    pixel_count = width * height * channels
+    if pixel_count == 0:
+        return None
     
-    if use_vectorized and np is not None:
-        # Use NumPy for faster processing
-        pixels_np = np.array(pixels)
-        
-        # Reshape to RGBA format
-        pixels_np = pixels_np.reshape(-1, 4)
-        
-        # Calculate average color (ignoring alpha)
-        avg_color = pixels_np[:, :3].mean(axis=0)
-        
-        return avg_color.tolist()
-    else:
-        # Fallback to pure Python
-        total_r, total_g, total_b = 0, 0, 0
-        pixel_count = len(pixels) // 4
-        
-        for i in range(0, len(pixels), 4):
-            total_r += pixels[i]
-            total_g += pixels[i+1]
-            total_b += pixels[i+2]
-        
-        if pixel_count > 0:
-            return [total_r / pixel_count, total_g / pixel_count, total_b / pixel_count]
-        else:
-            return None
+    cache_key = (image.name, width, height, pixel_count)
+    cached = _image_color_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+    
+    # Copy the pixels straight into a float32 buffer (no per-float Python objects)
+    pixels_np = np.empty(pixel_count, dtype=np.float32)
+    image.pixels.foreach_get(pixels_np)
+    
+    # Average the RGB channels of the flat buffer (ignoring alpha); an evenly
+    # strided subset of pixels gives the same mean well within 8-bit precision
+    pixels_np = pixels_np.reshape(-1, channels)
+    stride = max(1, len(pixels_np) // _AVERAGE_COLOR_MAX_SAMPLES)
+    avg_color = pixels_np[::stride, :3].mean(axis=0, dtype=np.float64).tolist()
+    if channels < 3:
+        # Single-channel (and gray + alpha) buffers average to a gray
+        avg_color = [avg_color[0]] * 3
+    _image_color_cache[cache_key] = avg_color
+    
+    return list(avg_color)
 
 def find_image_node(node, visited=None):
     """Find the first image node connected to the given node"""
@@ -546,34 +593,21 @@ def find_image_node(node, visited=None):
     
     return None
 
-def find_color_source(node, socket_name=None, visited=None):
+def _linked_node(node, index):
+    """Return the node linked into input `index` of `node`, or None"""
+    inputs = node.inputs
+    if len(inputs) > index:
+        links = inputs[index].links
+        if links:
+            return links[0].from_node
+    return None
+
+def _color_source_inputs(node, socket_name):
     """
-    Recursively trace color data through nodes to find the source
-    This is an enhanced version that handles mix nodes and node groups
+    Yield the (node, socket_name) entries find_color_source should try after `node`,
+    in priority order. Generated lazily so links are only walked when reached.
     """
-    if visited is None:
-        visited = set()
-    
-    # Avoid infinite recursion
-    node_id = (node, socket_name)
-    if node_id in visited:
-        return None, None
-    
-    visited.add(node_id)
-    
-    # Handle different node types
-    if node.type == 'TEX_IMAGE' and node.image:
-        # Direct image texture
-        return node, 'Color'
-    
-    elif node.type == 'RGB':
-        # Direct RGB color
-        return node, 'Color'
-    
-    elif node.type == 'VALTORGB':  # Color Ramp
-        return node, 'Color'
-    
-    elif node.type == 'MIX_RGB' or node.type == 'MIX':
+    if node.type == 'MIX_RGB' or node.type == 'MIX':
         # For mix nodes, check the factor to determine which input to prioritize
         factor = 0.5  # Default to equal mix
         
@@ -582,52 +616,13 @@ def find_color_source(node, socket_name=None, visited=None):
             if hasattr(node.inputs[0], 'default_value'):
                 factor = node.inputs[0].default_value
         
-        # If factor is close to 0, prioritize the first color input
-        # If factor is close to 1, prioritize the second color input
-        # Otherwise, check both with second having slightly higher priority
-        
-        if factor < 0.1:  # Strongly favor first input
-            if len(node.inputs) >= 2 and node.inputs[1].links:
-                color1_node = node.inputs[1].links[0].from_node
-                result_node, result_socket = find_color_source(color1_node, None, visited)
-                if result_node:
-                    return result_node, result_socket
-                    
-            # Fallback to second input
-            if len(node.inputs) >= 3 and node.inputs[2].links:
-                color2_node = node.inputs[2].links[0].from_node
-                result_node, result_socket = find_color_source(color2_node, None, visited)
-                if result_node:
-                    return result_node, result_socket
-                    
-        elif factor > 0.9:  # Strongly favor second input
-            if len(node.inputs) >= 3 and node.inputs[2].links:
-                color2_node = node.inputs[2].links[0].from_node
-                result_node, result_socket = find_color_source(color2_node, None, visited)
-                if result_node:
-                    return result_node, result_socket
-                    
-            # Fallback to first input
-            if len(node.inputs) >= 2 and node.inputs[1].links:
-                color1_node = node.inputs[1].links[0].from_node
-                result_node, result_socket = find_color_source(color1_node, None, visited)
-                if result_node:
-                    return result_node, result_socket
-        else:
-            # Check both inputs with slight preference for the second input (usually the main color)
-            # First try Color2 (second input)
-            if len(node.inputs) >= 3 and node.inputs[2].links:
-                color2_node = node.inputs[2].links[0].from_node
-                result_node, result_socket = find_color_source(color2_node, None, visited)
-                if result_node:
-                    return result_node, result_socket
-            
-            # Then try Color1 (first input)
-            if len(node.inputs) >= 2 and node.inputs[1].links:
-                color1_node = node.inputs[1].links[0].from_node
-                result_node, result_socket = find_color_source(color1_node, None, visited)
-                if result_node:
-                    return result_node, result_socket
+        # If factor is close to 0, prioritize the first color input (Color1);
+        # otherwise the second one (Color2, usually the main color) goes first
+        order = (1, 2) if factor < 0.1 else (2, 1)
+        for index in order:
+            color_node = _linked_node(node, index)
+            if color_node is not None:
+                yield color_node, None
     
     elif node.type == 'GROUP':
         # Handle node groups by finding the group output node and tracing back
@@ -640,88 +635,119 @@ def find_color_source(node, socket_name=None, visited=None):
                         if output.links and (socket_name is None or output.name == socket_name):
                             # Find the corresponding input in the group output node
                             if i < len(group_node.inputs) and group_node.inputs[i].links:
+                                # The group's result is whatever this source yields
                                 input_link = group_node.inputs[i].links[0]
-                                source_node = input_link.from_node
-                                source_socket = input_link.from_socket.name
-                                return find_color_source(source_node, source_socket, visited)
+                                yield input_link.from_node, input_link.from_socket.name
+                                return
     
     elif node.type == 'BSDF_PRINCIPLED':
-        # If we somehow got to a principled BSDF node, check its base color input
+        # If we somehow got to a principled BSDF node, its base color input decides
         base_color_input = node.inputs.get('Base Color')
         if base_color_input and base_color_input.links:
-            connected_node = base_color_input.links[0].from_node
-            return find_color_source(connected_node, None, visited)
+            yield base_color_input.links[0].from_node, None
+            return
     
     # For shader nodes, try to find color inputs
     elif 'BSDF' in node.type or 'SHADER' in node.type:
         # Look for color inputs in shader nodes
-        color_input_names = ['Color', 'Base Color', 'Diffuse Color', 'Tint']
-        for name in color_input_names:
+        for name in ('Color', 'Base Color', 'Diffuse Color', 'Tint'):
             input_socket = node.inputs.get(name)
             if input_socket and input_socket.links:
-                connected_node = input_socket.links[0].from_node
-                result_node, result_socket = find_color_source(connected_node, None, visited)
-                if result_node:
-                    return result_node, result_socket
+                yield input_socket.links[0].from_node, None
     
-    # For other node types, check all inputs
+    # For other node types (and as a fallback for the above), check all inputs
     for input_socket in node.inputs:
         if input_socket.links:
-            from_node = input_socket.links[0].from_node
-            result_node, result_socket = find_color_source(from_node, None, visited)
-            if result_node:
-                return result_node, result_socket
+            yield input_socket.links[0].from_node, None
+
+def find_color_source(node, socket_name=None, visited=None):
+    """
+    Trace color data through nodes to find the source
+    This is an enhanced version that handles mix nodes and node groups
+    
+    Depth-first over an explicit stack of input iterators rather than recursion;
+    (node, socket_name) pairs are only explored once per search.
+    """
+    if visited is None:
+        visited = set()
+    
+    stack = [iter(((node, socket_name),))]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            # All inputs of this node were exhausted without finding a source
+            stack.pop()
+            continue
+        
+        # Avoid infinite loops and re-exploring shared branches
+        if entry in visited:
+            continue
+        visited.add(entry)
+        
+        current = entry[0]
+        current_type = current.type
+        if (current_type == 'TEX_IMAGE' and current.image) or current_type in ('RGB', 'VALTORGB'):
+            # Direct image texture, RGB color or Color Ramp
+            return current, 'Color'
+        
+        stack.append(_color_source_inputs(current, entry[1]))
     
     # If we get here, no color source was found
     return None, None
 
+def _find_principled_base_color(material):
+    """Return (principled_node, base_color_input) for a node material, either may be None"""
+    # Find the first Principled BSDF node
+    principled_node = next(
+        (node for node in material.node_tree.nodes if node.type == 'BSDF_PRINCIPLED'),
+        None,
+    )
+    if principled_node is None:
+        return None, None
+    
+    # Get the Base Color input
+    return principled_node, principled_node.inputs.get('Base Color')
+
 def get_final_color(material):
     """Get the final color for a material"""
     if not material or not material.use_nodes:
-        print(f"Material {material.name if material else 'None'} has no nodes")
+        _log.debug("Material %s has no nodes", material.name if material else 'None')
         return None
     
-    # Find the Principled BSDF node
-    principled_node = None
-    for node in material.node_tree.nodes:
-        if node.type == 'BSDF_PRINCIPLED':
-            principled_node = node
-            break
+    principled_node, base_color_input = _find_principled_base_color(material)
     
     if not principled_node:
-        print(f"Material {material.name}: No Principled BSDF node found")
+        _log.debug("Material %s: No Principled BSDF node found", material.name)
         return None
     
-    # Get the Base Color input
-    base_color_input = principled_node.inputs.get('Base Color')
     if not base_color_input:
-        print(f"Material {material.name}: No Base Color input found")
+        _log.debug("Material %s: No Base Color input found", material.name)
         return None
     
     # Check if there's a texture connected to the Base Color input
     if base_color_input.links:
         connected_node = base_color_input.links[0].from_node
-        print(f"Material {material.name}: Base Color connected to {connected_node.name} of type {connected_node.type}")
+        _log.debug("Material %s: Base Color connected to %s of type %s", material.name, connected_node.name, connected_node.type)
         
         # Use the enhanced color source finding function
         source_node, source_socket = find_color_source(connected_node)
         
         if source_node:
-            print(f"Material {material.name}: Found color source node {source_node.name} of type {source_node.type}")
+            _log.debug("Material %s: Found color source node %s of type %s", material.name, source_node.name, source_node.type)
             
             # Handle different source node types
             if source_node.type == 'TEX_IMAGE' and source_node.image:
-                print(f"Material {material.name}: Using image texture {source_node.image.name}")
+                _log.debug("Material %s: Using image texture %s", material.name, source_node.image.name)
                 color = get_average_color(source_node.image)
                 if color:
-                    print(f"Material {material.name}: Image average color = {color}")
+                    _log.debug("Material %s: Image average color = %s", material.name, color)
                     return color
                 else:
-                    print(f"Material {material.name}: Could not calculate image average color")
+                    _log.debug("Material %s: Could not calculate image average color", material.name)
             
             # If it's a color ramp, get the average color from the ramp
             elif source_node.type == 'VALTORGB':  # Color Ramp node
-                print(f"Material {material.name}: Using color ramp")
+                _log.debug("Material %s: Using color ramp", material.name)
                 # Get the average of the color stops
                 elements = source_node.color_ramp.elements
                 if elements:
@@ -736,13 +762,13 @@ def get_final_color(material):
                     avg_color[1] /= len(elements)
                     avg_color[2] /= len(elements)
                     
-                    print(f"Material {material.name}: Color ramp average = {avg_color}")
+                    _log.debug("Material %s: Color ramp average = %s", material.name, avg_color)
                     return avg_color
             
             # If it's an RGB node, use its color
             elif source_node.type == 'RGB':
                 color = list(source_node.outputs[0].default_value)[:3]
-                print(f"Material {material.name}: RGB node color = {color}")
+                _log.debug("Material %s: RGB node color = %s", material.name, color)
                 return color
             
             # For other node types, try to get color from the output socket
@@ -751,24 +777,25 @@ def get_final_color(material):
                     if output.name == source_socket:
                         if hasattr(output, 'default_value') and len(output.default_value) >= 3:
                             color = list(output.default_value)[:3]
-                            print(f"Material {material.name}: Node output socket color = {color}")
+                            _log.debug("Material %s: Node output socket color = %s", material.name, color)
                             return color
             
-            print(f"Material {material.name}: Could not extract color from source node {source_node.name} of type {source_node.type}")
+            _log.debug("Material %s: Could not extract color from source node %s of type %s", material.name, source_node.name, source_node.type)
         else:
-            print(f"Material {material.name}: Could not find color source node in the node tree")
+            _log.debug("Material %s: Could not find color source node in the node tree", material.name)
             
-            # Debug: Print the node tree structure to help diagnose the issue
-            print(f"Material {material.name}: Node tree structure:")
-            for node in material.node_tree.nodes:
-                print(f"  - Node: {node.name}, Type: {node.type}")
-                for input_socket in node.inputs:
-                    if input_socket.links:
-                        print(f"    - Input: {input_socket.name} connected to {input_socket.links[0].from_node.name}")
+            # Debug: Log the node tree structure to help diagnose the issue
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("Material %s: Node tree structure:", material.name)
+                for node in material.node_tree.nodes:
+                    _log.debug("  - Node: %s, Type: %s", node.name, node.type)
+                    for input_socket in node.inputs:
+                        if input_socket.links:
+                            _log.debug("    - Input: %s connected to %s", input_socket.name, input_socket.links[0].from_node.name)
     
     # If no texture or couldn't get texture color, use the base color value
     color = list(base_color_input.default_value)[:3]
-    print(f"Material {material.name}: Using base color value = {color}")
+    _log.debug("Material %s: Using base color value = %s", material.name, color)
     return color
 
 def find_diffuse_texture(material):
@@ -776,18 +803,8 @@ def find_diffuse_texture(material):
     if not material or not material.use_nodes:
         return None
     
-    # Find the principled BSDF node
-    principled_node = None
-    for node in material.node_tree.nodes:
-        if node.type == 'BSDF_PRINCIPLED':
-            principled_node = node
-            break
-    
-    if not principled_node:
-        return None
-    
-    # Find the base color input
-    base_color_input = principled_node.inputs.get('Base Color')
+    # Find the principled BSDF node's base color input
+    _, base_color_input = _find_principled_base_color(material)
     if not base_color_input or not base_color_input.links:
         return None
     
@@ -803,20 +820,79 @@ def find_diffuse_texture(material):
     
     return None
 
+@bpy.app.handlers.persistent
+def _prune_material_results(scene, depsgraph=None):
+    """Drop results for materials that no longer exist, outside of panel draw"""
+    if not material_results:
+        return
+    existing = set(bpy.data.materials.keys())
+    stale = [name for name in material_results if name not in existing]
+    for name in stale:
+        del material_results[name]
+
+@bpy.app.handlers.persistent
+def _invalidate_material_users(scene, depsgraph=None):
+    """Drop the material -> object index when objects, meshes or materials change"""
+    global _material_users
+    if _material_users is None:
+        return
+    if depsgraph is None or any(depsgraph.id_type_updated(id_type) for id_type in ('OBJECT', 'MESH', 'MATERIAL')):
+        _material_users = None
+
+def _build_material_users():
+    """Index the first mesh object (in bpy.data.objects order) and slot using each material"""
+    users = {}
+    for obj in bpy.data.objects:
+        if obj.type != 'MESH':
+            continue
+        # Objects are held by name and library rather than by reference, so the
+        # index never points at freed data after undo
+        key = (obj.name, obj.library.filepath if obj.library else None)
+        for slot_index, mat in enumerate(obj.data.materials):
+            if mat is not None:
+                users.setdefault(mat.session_uid, (key, slot_index))
+    return users
+
+def _find_material_user(material):
+    """
+    Get the first mesh object using a material and the slot it is in
+    
+    Entries are checked against the current data before use; a missing or
+    outdated entry rebuilds the index once, so a missed invalidation can't
+    select the wrong object.
+    
+    Returns:
+        tuple: (object, slot_index), or (None, -1) if no mesh object uses the material
+    """
+    global _material_users
+    rebuilt = False
+    while True:
+        if _material_users is None:
+            _material_users = _build_material_users()
+            rebuilt = True
+        entry = _material_users.get(material.session_uid)
+        if entry is not None:
+            key, slot_index = entry
+            obj = bpy.data.objects.get(key)
+            if obj is not None and obj.type == 'MESH':
+                mats = obj.data.materials
+                if slot_index < len(mats) and mats[slot_index] == material:
+                    return obj, slot_index
+        if rebuilt:
+            return None, -1
+        _material_users = None
+
+_STATUS_ICON = {
+    RBST_ViewDisp_MaterialStatus.PENDING: 'TRIA_RIGHT',
+    RBST_ViewDisp_MaterialStatus.PROCESSING: 'SORTTIME',
+    RBST_ViewDisp_MaterialStatus.COMPLETED: 'CHECKMARK',
+    RBST_ViewDisp_MaterialStatus.PREVIEW_BASED: 'IMAGE_DATA',
+    RBST_ViewDisp_MaterialStatus.FAILED: 'ERROR',
+}
+
 def get_status_icon(status):
     """Get the icon for a material status"""
-    if status == RBST_ViewDisp_MaterialStatus.PENDING:
-        return 'TRIA_RIGHT'
-    elif status == RBST_ViewDisp_MaterialStatus.PROCESSING:
-        return 'SORTTIME'
-    elif status == RBST_ViewDisp_MaterialStatus.COMPLETED:
-        return 'CHECKMARK'
-    elif status == RBST_ViewDisp_MaterialStatus.PREVIEW_BASED:
-        return 'IMAGE_DATA'
-    elif status == RBST_ViewDisp_MaterialStatus.FAILED:
-        return 'ERROR'
-    else:
-        return 'QUESTION'
+    return _STATUS_ICON.get(status, 'QUESTION')
 
 def get_status_text(status):
     """Get the text for a material status"""
@@ -869,7 +945,6 @@ class RBST_ViewDisp_PT_BulkViewportDisplay(bpy.types.Panel):
         if context.scene.viewport_colors_show_advanced:
             adv_col = box.column(align=True)
             adv_col.prop(context.scene, "viewport_colors_batch_size")
-            adv_col.prop(context.scene, "viewport_colors_use_vectorized")
             adv_col.prop(context.scene, "viewport_colors_darken_amount")
             adv_col.prop(context.scene, "viewport_colors_value_amount")
         
@@ -901,16 +976,15 @@ class RBST_ViewDisp_PT_BulkViewportDisplay(bpy.types.Panel):
                 row = material_box.row()
                 col = row.column()
                 
-                # Collect materials to remove
-                materials_to_remove = []
+                # Resolve material names once per draw instead of a collection lookup per row
+                materials_by_name = {mat.name: mat for mat in bpy.data.materials}
                 
                 # Count materials by status
                 preview_count = 0
                 failed_count = 0
                 
-                # Display material results - use a copy of the keys to avoid modification during iteration
-                for material_name in list(material_results.keys()):
-                    color, status = material_results[material_name]
+                # Display material results - stale entries are pruned by the depsgraph handler, not here
+                for material_name, (color, status) in material_results.items():
                     
                     # Update counts
                     if status == RBST_ViewDisp_MaterialStatus.PREVIEW_BASED:
@@ -921,7 +995,7 @@ class RBST_ViewDisp_PT_BulkViewportDisplay(bpy.types.Panel):
                     row = col.row(align=True)
                     
                     # Add status icon
-                    row.label(text="", icon=get_status_icon(status))
+                    row.label(text="", icon=_STATUS_ICON.get(status, 'QUESTION'))
                     
                     # Add material name with operator to select it
                     op = row.operator("bst.select_in_editor", text=material_name)
@@ -929,18 +1003,12 @@ class RBST_ViewDisp_PT_BulkViewportDisplay(bpy.types.Panel):
                     
                     # Add color preview
                     if color:
-                        material = bpy.data.materials.get(material_name)
+                        material = materials_by_name.get(material_name)
                         if material:  # Check if material still exists
                             row.prop(material, "diffuse_color", text="")
                         else:
                             # Material no longer exists, show a placeholder color
                             row.label(text="", icon='ERROR')
-                            # Mark for removal
-                            materials_to_remove.append(material_name)
-                
-                # Remove materials that no longer exist
-                for material_name in materials_to_remove:
-                    material_results.pop(material_name, None)
                 
                 # Show statistics
                 if len(material_results) > 0:
@@ -979,32 +1047,29 @@ class RBST_ViewDisp_OT_SelectInEditor(bpy.types.Operator):
             self.report({'ERROR'}, f"Material '{self.material_name}' not found")
             return {'CANCELLED'}
         
-        # Find an object using this material
-        for obj in bpy.data.objects:
-            if obj.type == 'MESH' and obj.data.materials:
-                for i, mat in enumerate(obj.data.materials):
-                    if mat == material:
-                        # Select the object
-                        bpy.ops.object.select_all(action='DESELECT')
-                        obj.select_set(True)
-                        context.view_layer.objects.active = obj
-                        
-                        # Set the active material index
-                        obj.active_material_index = i
-                        
-                        # Switch to material properties
-                        for area in context.screen.areas:
-                            if area.type == 'PROPERTIES':
-                                for space in area.spaces:
-                                    if space.type == 'PROPERTIES':
-                                        space.context = 'MATERIAL'
-                        
-                        return {'FINISHED'}
+        # Find an object using this material through the material -> object index
+        obj, slot_index = _find_material_user(material)
+        if obj is not None:
+            # Select the object
+            bpy.ops.object.select_all(action='DESELECT')
+            obj.select_set(True)
+            context.view_layer.objects.active = obj
+            
+            # Set the active material index
+            obj.active_material_index = slot_index
+            
+            # Switch to material properties and redraw them in the same pass
+            for area in context.screen.areas:
+                if area.type == 'PROPERTIES':
+                    area.spaces.active.context = 'MATERIAL'
+                    area.tag_redraw()
+            
+            return {'FINISHED'}
         
         self.report({'WARNING'}, f"No object using material '{self.material_name}' found")
         return {'CANCELLED'}
 
-def get_color_from_preview(material, use_vectorized=True):
+def get_color_from_preview(material):
     """Extract the average color from a material thumbnail"""
     if not material:
         return None
@@ -1024,56 +1089,38 @@ def get_color_from_preview(material, use_vectorized=True):
     
     # Access the preview image data - these are the same thumbnails shown in the material panel
     preview_image = preview.icon_pixels_float
+    pixel_count = len(preview_image) if preview_image else 0
     
-    if not preview_image or len(preview_image) == 0:
+    if pixel_count == 0:
         return None
     
-    if use_vectorized and np is not None:
-        # Use NumPy for faster processing
-        pixels_np = np.array(preview_image)
-        
-        # Reshape to RGBA format (preview is stored as a flat RGBA array)
-        pixels_np = pixels_np.reshape(-1, 4)
-        
-        # Calculate average color (ignoring alpha and any pure black pixels which are often the background)
-        # Filter out black pixels (background) by checking if R+G+B is very small
-        non_black_mask = np.sum(pixels_np[:, :3], axis=1) > 0.05
-        
-        if np.any(non_black_mask):
-            # Only use non-black pixels for the average
-            avg_color = pixels_np[non_black_mask][:, :3].mean(axis=0)
-            return avg_color.tolist()
-        else:
-            # If all pixels are black, return the average of all pixels
-            avg_color = pixels_np[:, :3].mean(axis=0)
-            return avg_color.tolist()
-    else:
-        # Fallback to pure Python
-        total_r, total_g, total_b = 0, 0, 0
-        pixel_count = 0
-        non_black_count = 0
-        
-        # Process pixels in groups of 4 (RGBA)
-        for i in range(0, len(preview_image), 4):
-            r, g, b, a = preview_image[i:i+4]
-            
-            # Skip black pixels (background)
-            if r + g + b > 0.05:
-                total_r += r
-                total_g += g
-                total_b += b
-                non_black_count += 1
-            
-            pixel_count += 1
-        
-        # If we found non-black pixels, use their average
-        if non_black_count > 0:
-            return [total_r / non_black_count, total_g / non_black_count, total_b / non_black_count]
-        # Otherwise, use the average of all pixels
-        elif pixel_count > 0:
-            return [total_r / pixel_count, total_g / pixel_count, total_b / pixel_count]
-        else:
-            return None
+    # Copy the thumbnail (icon-sized, far smaller than the source textures) into a float32
+    # buffer; previews share one size, so the buffer is reused between materials
+    global _preview_buffer
+    if _preview_buffer is None or len(_preview_buffer) != pixel_count:
+        _preview_buffer = np.empty(pixel_count, dtype=np.float32)
+    pixels_np = _preview_buffer
+    preview_image.foreach_get(pixels_np)
+    
+    # Reshape to RGBA format (preview is stored as a flat RGBA array)
+    pixels_np = pixels_np.reshape(-1, 4)
+    rgb = pixels_np[:, :3]
+    
+    # Calculate average color (ignoring alpha and any pure black pixels which are often the background)
+    # Filter out black pixels (background) by checking if R+G+B is very small
+    non_black_mask = rgb.sum(axis=1) > 0.05
+    # Prefer pixels that are also opaque so a transparent backdrop doesn't wash the color out
+    opaque_mask = non_black_mask & (pixels_np[:, 3] > 0.01)
+    
+    for mask in (opaque_mask, non_black_mask):
+        count = np.count_nonzero(mask)
+        if count:
+            # Only use the masked pixels for the average; einsum sums the masked rows
+            # in a single pass instead of materializing rgb[mask] first
+            return (np.einsum('ij,i->j', rgb, mask, dtype=np.float64) / count).tolist()
+    
+    # If all pixels are black, return the average of all pixels
+    return rgb.mean(axis=0, dtype=np.float64).tolist()
 
 class RBST_ViewDisp_OT_SelectDiffuseNodes(bpy.types.Operator):
     bl_idname = "bst.select_diffuse_nodes"
@@ -1105,8 +1152,18 @@ def register():
     
     # Register properties
     RBST_ViewDisp_register_properties()
+    
+    for handler in (_prune_material_results, _invalidate_material_users):
+        if handler not in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.append(handler)
 
 def unregister():
+    global _material_users
+    for handler in (_prune_material_results, _invalidate_material_users):
+        if handler in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(handler)
+    _material_users = None
+    
     # Unregister properties
     try:
         RBST_ViewDisp_unregister_properties()
@@ -1114,4 +1171,4 @@ def unregister():
         pass
     # Unregister classes
     for cls in reversed(classes):
-        compat.safe_unregister_class(cls) 
\ No newline at end of file
+        compat.safe_unregister_class(cls)
\ No newline at end of file